@@ -1,9 +1,11 @@
 import asyncio
 import re
-from datetime import datetime, timedelta, UTC
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta, UTC
 from itertools import chain
 import os
 import sys
+import weakref
 # 添加当前目录到sys.path，确保能找到同目录下的模块
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
@@ -13,13 +15,100 @@ from aiohttp import ClientTimeout
 from bs4 import BeautifulSoup, NavigableString, Tag
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn
+from async_translator import TRANSLATE_CONCURRENCY, new_translate_session
 from arxiv_time import next_arxiv_update_day
 from paper import Paper, PaperDatabase, PaperExporter
-import xml.etree.ElementTree as ET
 import urllib.parse
 
+# 优先使用lxml(libxml2 C实现)解析API返回的XML，不可用时退回标准库
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+# BeautifulSoup同样优先使用lxml作为解析后端，比纯Python的html.parser快得多
+HTML_PARSER = "lxml" if HAS_LXML else "html.parser"
+# 可选的C实现ISO日期解析
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    _parse_iso = None
+
 # 全局配置
 PREV_DAY = 4  # 检查过去时间的范围（天数）
+API_CONCURRENCY = 4  # 同时向arXiv发出的请求数上限(进程内所有爬虫共用)
+TRANSLATE_BATCH = 20  # 每组批量翻译的论文数
+
+# arXiv API返回的Atom XML中的标签(Clark记法)
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+T_ENTRY = ATOM_NS + "entry"
+T_ID = ATOM_NS + "id"
+T_TITLE = ATOM_NS + "title"
+T_SUMMARY = ATOM_NS + "summary"
+T_AUTHOR = ATOM_NS + "author"
+T_NAME = ATOM_NS + "name"
+T_PUBLISHED = ATOM_NS + "published"
+T_CATEGORY = ATOM_NS + "category"
+T_COMMENT = ARXIV_NS + "comment"
+T_TOTAL_RESULTS = "{http://a9.com/-/spec/opensearch/1.1/}totalResults"
+
+_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})")  # API日期的年月日部分
+_WS_RE = re.compile(r"\s+")  # 连续空白，用于把多行标题/摘要压成一行
+_CS_MATCH = re.compile(r"cs\.").match  # 以cs.开头的领域
+
+
+def parse_api_date(date_str) -> datetime:
+    """
+    解析API返回的ISO格式日期(2024-08-26T17:59:59Z), 只取年月日
+    安装了ciso8601时使用其C实现, 否则使用预编译的正则
+    """
+    if _parse_iso is not None:
+        return _parse_iso(date_str[:10])
+    m = _DATE_RE.match(date_str)
+    return datetime(int(m[1]), int(m[2]), int(m[3]))
+
+
+_MONTHS = {
+    "January": 1, "February": 2, "March": 3, "April": 4, "May": 5, "June": 6,
+    "July": 7, "August": 8, "September": 9, "October": 10, "November": 11, "December": 12,
+}  # 搜索页面日期中的英文月份
+
+
+def parse_search_date(date_str) -> datetime:
+    """
+    解析搜索页面上的提交日期(8 August, 2024)
+    直接查表得到月份，比datetime.strptime(date_str, "%d %B, %Y")快得多；格式不符时仍交给strptime处理
+    """
+    try:
+        day_month, year = date_str.split(", ")
+        day, month = day_month.split()
+        return datetime(int(year), _MONTHS[month], int(day))
+    except (ValueError, KeyError):
+        return datetime.strptime(date_str, "%d %B, %Y")
+
+
+# 每个事件循环一个信号量，同一进程内所有ArxivScraper共用，
+# 多个群聊同时抓取时对arXiv的并发请求总数仍不超过API_CONCURRENCY
+_arxiv_semaphores = weakref.WeakKeyDictionary()  # 事件循环 -> 信号量
+
+
+def arxiv_semaphore() -> asyncio.Semaphore:
+    """当前事件循环中限制arXiv并发请求数的信号量"""
+    loop = asyncio.get_running_loop()
+    sem = _arxiv_semaphores.get(loop)
+    if sem is None:
+        sem = _arxiv_semaphores[loop] = asyncio.Semaphore(API_CONCURRENCY)
+    return sem
+
+
+def is_cs_only(categories) -> bool:
+    """
+    判断论文是否只属于计算机领域(所有tag都以cs.开头), 没有tag的论文不算
+    """
+    return bool(categories) and all(map(_CS_MATCH, categories))
+
 
 class ArxivScraper(object):
     def __init__(
@@ -79,25 +168,28 @@ class ArxivScraper(object):
             self.optional_keywords = [["browse", "research"]]
             self.required_keywords = ["agent"]
 
+        # 关键词确定后预先构建查询字符串，每个批次只需要替换start
+        self._api_url_tmpl = self._build_api_url_template()
+        self._search_terms = self._build_search_terms()
+
         self.filt_date_by = "announced_date_first"  # url
         self.order = "-announced_date_first"  # url(结果默认按首次公布日期的降序排列，这样最新公布的会在前面)
         self.total = None  # fetch_all
         self.step = 50  # url, fetch_all
         self.papers: list[Paper] = []  # fetch_all
+        # lxml的解析器可以在多个批次间复用，避免每次重新初始化
+        self._xml_parser = ET.XMLParser(recover=True) if HAS_LXML else None
+        self._session: aiohttp.ClientSession | None = None  # 爬取期间共享的session
 
         self.paper_db = PaperDatabase(db_path=self.db_path)
         self.paper_exporter = PaperExporter(self.date_from, self.date_until, self.category_blacklist, self.category_whitelist, database_path=self.db_path)
         self.console = Console()
 
-    def get_api_url(self, start=0, max_results=50):
+    def _build_api_url_template(self):
         """
-        使用arXiv API接口构建查询URL
+        构建arXiv API查询URL的模板，只有start和max_results两个占位符
         只在标题(ti:)和摘要(abs:)中搜索，required_keywords在标题或摘要中出现一处即可
-        例子：http://export.arxiv.org/api/query?search_query=(ti:A+OR+abs:A)+AND+(ti:B+OR+abs:B)&sortBy=submittedDate&sortOrder=descending
-        
-        Args:
-            start (int): 返回结果的起始序号
-            max_results (int): 每次查询的最大结果数
+        关键词在初始化后不再变化，因此查询部分只需要构建和编码一次
         """
         # 构建搜索查询字符串
         query_parts = []
@@ -105,10 +197,11 @@ class ArxivScraper(object):
         # 处理可选关键词 (二维数组，外层AND，内层OR) - 在标题或摘要中搜索
         if self.optional_keywords:
             for keyword_group in self.optional_keywords:
-                if keyword_group and isinstance(keyword_group, list):  # 确保组不为空
+                if keyword_group and isinstance(keyword_group, (list, tuple)):  # 确保组不为空(ChatConfig中的组是元组)
                     group_parts = []
                     for kw in keyword_group:
                         # 每个关键词在标题或摘要中出现即可
+                        kw = urllib.parse.quote_plus(kw)
                         group_parts.append(f"(ti:{kw}+OR+abs:{kw})")
                     # 组内用OR连接
                     group_query = "(" + "+OR+".join(group_parts) + ")"
@@ -117,6 +210,7 @@ class ArxivScraper(object):
         # 处理必需关键词 (AND 关系) - 在标题或摘要中搜索
         for kw in self.required_keywords:
             # 每个必需关键词必须在标题或摘要中出现
+            kw = urllib.parse.quote_plus(kw)
             query_parts.append(f"(ti:{kw}+OR+abs:{kw})")
         
         # 用AND连接所有部分
@@ -125,21 +219,76 @@ class ArxivScraper(object):
         else:
             search_query = "ti:*+OR+abs:*"  # 如果没有关键词，搜索所有标题和摘要
         
-        # URL编码
-        search_query = urllib.parse.quote(search_query, safe='+():')
+        # URL编码(关键词已单独编码，保留其中的%转义；花括号也会被编码，不会干扰下面的format占位符)
+        search_query = urllib.parse.quote(search_query, safe='+():%')
         
         # 构建完整的API URL
         base_url = "http://export.arxiv.org/api/query"
         params = [
             f"search_query={search_query}",
-            f"start={start}",
-            f"max_results={max_results}",
+            "start={start}",
+            "max_results={max_results}",
             "sortBy=submittedDate",
             "sortOrder=descending"
         ]
         
         return f"{base_url}?" + "&".join(params)
 
+    def get_api_url(self, start=0, max_results=50):
+        """
+        使用arXiv API接口构建查询URL
+        例子：http://export.arxiv.org/api/query?search_query=(ti:A+OR+abs:A)+AND+(ti:B+OR+abs:B)&sortBy=submittedDate&sortOrder=descending
+        
+        Args:
+            start (int): 返回结果的起始序号
+            max_results (int): 每次查询的最大结果数
+        """
+        return self._api_url_tmpl.format(start=start, max_results=max_results)
+
+    def _new_session(self):
+        """
+        创建访问arxiv用的ClientSession, 连接池在同一次爬取的所有请求间复用
+        """
+        # 只限制建立连接和两次读取之间的时间: total会把在连接池中排队的时间也算进去，
+        # 页面较多时排在后面的请求会在发出前就超时
+        timeout = ClientTimeout(total=None, sock_connect=10, sock_read=30)
+        # 同一主机最多保持API_CONCURRENCY个长连接，空闲连接保留60秒供后续批次复用
+        connector = aiohttp.TCPConnector(
+            limit=8,
+            limit_per_host=API_CONCURRENCY,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+        )
+        # 代理在session级别设置一次(aiohttp>=3.10), 每个请求不再单独传proxy
+        return aiohttp.ClientSession(trust_env=True, timeout=timeout, connector=connector, proxy=self.proxy)
+
+    @asynccontextmanager
+    async def _shared_session(self):
+        """
+        在上下文内让request/request_api共享同一个session, 避免每个批次重新建立TCP/TLS连接
+        """
+        async with self._new_session() as session:
+            self._session = session
+            try:
+                yield session
+            finally:
+                self._session = None
+
+    async def _get_bytes(self, url):
+        """
+        请求url并返回原始字节, 交给解析器自行解码, 优先使用共享session, 否则临时创建一个
+        所有爬虫共用arxiv_semaphore限制并发请求数
+        """
+        async with arxiv_semaphore():
+            if self._session is None:
+                async with self._new_session() as session:
+                    async with session.get(url) as response:
+                        response.raise_for_status()
+                        return await response.read()
+            async with self._session.get(url) as response:
+                response.raise_for_status()
+                return await response.read()
+
     async def request_api(self, start=0, max_results=50):
         """
         异步请求arXiv API，重试至多3次
@@ -148,12 +297,7 @@ class ArxivScraper(object):
         url = self.get_api_url(start, max_results)
         while error <= 3:
             try:
-                timeout = ClientTimeout(total=30)
-                async with aiohttp.ClientSession(trust_env=True, timeout=timeout) as session:
-                    async with session.get(url, proxy=self.proxy) as response:
-                        response.raise_for_status()
-                        content = await response.text()
-                        return content
+                return await self._get_bytes(url)
             except Exception as e:
                 error += 1
                 self.console.log(f"[bold red]API Request {start} cause error: ")
@@ -169,100 +313,92 @@ class ArxivScraper(object):
         解析arXiv API返回的XML内容
         
         Args:
-            xml_content (str): API返回的XML内容
+            xml_content (bytes): API返回的XML内容
             
         Returns:
-            list[Paper]: 解析出的论文列表
+            tuple[list[Paper], int | None, datetime | None]: 解析出的论文列表,
+                opensearch:totalResults给出的总数(缺失时为None), 以及这一批中最早的提交日期(没有论文时为None)
         """
         if xml_content is None:
             self.console.log("[bold red]Cannot parse None XML content")
-            return []
+            return [], None, None
         
         try:
-            root = ET.fromstring(xml_content)
-            # 定义命名空间
-            namespaces = {
-                'atom': 'http://www.w3.org/2005/Atom',
-                'arxiv': 'http://arxiv.org/schemas/atom'
-            }
-            
+            root = ET.fromstring(xml_content, self._xml_parser)
+
             papers = []
-            entries = root.findall('atom:entry', namespaces)
-            
-            for entry in entries:
-                # 获取URL
-                url_elem = entry.find('atom:id', namespaces)
-                url = url_elem.text if url_elem is not None else "No URL"
-                
-                # 获取标题
-                title_elem = entry.find('atom:title', namespaces)
-                title = title_elem.text.strip() if title_elem is not None else "No title"
-                
-                # 获取摘要
-                summary_elem = entry.find('atom:summary', namespaces)
-                abstract = summary_elem.text.strip() if summary_elem is not None else "No summary"
-                
-                # 获取作者
+            total = None
+            earliest_date = None
+            ws_sub = _WS_RE.sub  # 局部别名，避免循环内重复属性查找
+            for entry in root:
+                # 总数和论文条目都是feed的直接子节点，在同一次遍历中取出
+                if entry.tag == T_TOTAL_RESULTS:
+                    total = int(entry.text)
+                    continue
+                if entry.tag != T_ENTRY:
+                    continue
+                # 单次遍历entry的子节点，按标签分发，避免对每个字段重复find
+                url = "No URL"
+                title = "No title"
+                abstract = "No summary"
                 authors = []
-                author_elems = entry.findall('atom:author', namespaces)
-                for author_elem in author_elems:
-                    name_elem = author_elem.find('atom:name', namespaces)
-                    if name_elem is not None:
-                        authors.append(name_elem.text)
-                authors_str = ", ".join(authors) if authors else "No authors"
-                
-                # 获取提交日期
-                published_elem = entry.find('atom:published', namespaces)
-                if published_elem is not None:
-                    # 解析ISO格式的日期：2024-08-26T17:59:59Z
-                    date_str = published_elem.text
-                    # 移除时区信息并解析
-                    date_str = date_str.replace('Z', '').split('T')[0]
-                    first_submitted_date = datetime.strptime(date_str, "%Y-%m-%d")
-                else:
-                    first_submitted_date = datetime.now()
-                
-                # 获取分类
+                first_submitted_date = None
                 categories = []
-                category_elems = entry.findall('atom:category', namespaces)
-                for cat_elem in category_elems:
-                    term = cat_elem.get('term')
-                    if term:
-                        categories.append(term)
-                
-                # 获取评论（如果有）
-                comment_elem = entry.find('arxiv:comment', namespaces)
-                comments = comment_elem.text if comment_elem is not None else "No comments"
-                
+                comments = "No comments"
+                for child in entry:
+                    tag = child.tag
+                    if tag == T_ID:
+                        url = child.text
+                    elif tag == T_TITLE:
+                        title = ws_sub(' ', child.text).strip()
+                    elif tag == T_SUMMARY:
+                        abstract = ws_sub(' ', child.text).strip()
+                    elif tag == T_AUTHOR:
+                        name = child.findtext(T_NAME)
+                        if name is not None:
+                            authors.append(name)
+                    elif tag == T_PUBLISHED:
+                        first_submitted_date = parse_api_date(child.text)
+                    elif tag == T_CATEGORY:
+                        term = child.get('term')
+                        if term:
+                            categories.append(term)
+                    elif tag == T_COMMENT:
+                        comments = child.text
+
+                if first_submitted_date is None:
+                    first_submitted_date = datetime.now()
+                if earliest_date is None or first_submitted_date < earliest_date:
+                    earliest_date = first_submitted_date
+                authors_str = ", ".join(authors) if authors else "No authors"
+
                 paper = Paper(
                     url=url,
-                    title=title.replace('\n', ' ').strip(),
+                    title=title,
                     first_submitted_date=first_submitted_date,
                     categories=categories,
                     authors=authors_str,
-                    abstract=abstract.replace('\n', ' ').strip(),
+                    abstract=abstract,
                     comments=comments,
                 )
                 # API模式下，设置首次公布日期等于提交日期
                 paper.first_announced_date = first_submitted_date
                 papers.append(paper)
-                
-            return papers
-            
+
+            return papers, total, earliest_date
+
         except ET.ParseError as e:
             self.console.log(f"[bold red]XML Parse Error: {e}")
-            return []
+            return [], None, None
         except Exception as e:
             self.console.log(f"[bold red]Error parsing API response: {e}")
-            return []
+            return [], None, None
 
 
     async def fetch_all_api(self):
         """
         使用arXiv API获取所有文章，最大支持1个月区间，严格按date_from和date_until过滤。
         """
-        from datetime import datetime, timedelta
-
         # 计算最大允许的区间（31天）
         date_from:datetime = datetime.strptime(self.date_from, "%Y-%m-%d")
         date_until:datetime = datetime.strptime(self.date_until, "%Y-%m-%d")
@@ -274,91 +410,84 @@ class ArxivScraper(object):
         self.console.log(f"[bold green]Fetching papers using arXiv API for range: {date_from} ~ {date_until}")
         self.console.print(f"[grey] {self.get_api_url(0, self.step)}")
 
-        xml_content = await self.request_api(0, self.step)
-        if xml_content is None:
-            self.console.log("[bold red]Failed to fetch initial API content, aborting...")
-            return
-
-        first_batch = self.parse_api_xml(xml_content)
-        self.papers.extend(first_batch)
-
-        # 从XML中获取总数信息
-        try:
-            root = ET.fromstring(xml_content)
-            namespaces = {'opensearch': 'http://a9.com/-/spec/opensearch/1.1/'}
-            total_elem = root.find('opensearch:totalResults', namespaces)
-            if total_elem is not None:
-                self.total = int(total_elem.text)
+        async with self._shared_session():
+            xml_content = await self.request_api(0, self.step)
+            if xml_content is None:
+                self.console.log("[bold red]Failed to fetch initial API content, aborting...")
+                return
+
+            # 解析第一批论文的同时从XML中获取总数信息
+            first_batch, total, _ = self.parse_api_xml(xml_content)
+            self.papers.extend(first_batch)
+            if total is not None:
+                self.total = total
             else:
-                if len(first_batch) < self.step:
-                    self.total = len(first_batch)
-                else:
-                    self.total = 1000
-        except:
-            self.total = len(first_batch) if len(first_batch) < self.step else 1000
-
-        self.console.log(f"[bold green]Total papers found: {self.total}")
-
-        # 分批获取所有结果
-        if self.total > self.step:
-            with Progress(
-                SpinnerColumn(),
-                *Progress.get_default_columns(),
-                TimeElapsedColumn(),
-                console=self.console,
-                transient=False,
-            ) as p:
-                task = p.add_task(
-                    description=f"[bold green]Fetching papers via API",
-                    total=min(self.total, 1000),
-                )
-                p.update(task, advance=len(first_batch))
-
-                async def wrapper(start):
-                    xml_content = await self.request_api(start, self.step)
-                    if xml_content is None:
-                        return []
-                    papers = self.parse_api_xml(xml_content)
-                    p.update(task, advance=len(papers))
-                    return papers
-
-                current_start = self.step
-                while current_start < min(self.total, 1000):
-                    papers_batch = await wrapper(current_start)
-                    self.papers.extend(papers_batch)
-                    if len(papers_batch) < self.step:
-                        break
-                    if papers_batch:
-                        earliest_date = min(paper.first_submitted_date for paper in papers_batch)
-                        if earliest_date < (date_from - timedelta(days=PREV_DAY)):
+                self.total = len(first_batch) if len(first_batch) < self.step else 1000
+
+            self.console.log(f"[bold green]Total papers found: {self.total}")
+
+            # 分批获取所有结果
+            if self.total > self.step:
+                with Progress(
+                    SpinnerColumn(),
+                    *Progress.get_default_columns(),
+                    TimeElapsedColumn(),
+                    console=self.console,
+                    transient=False,
+                ) as p:
+                    task = p.add_task(
+                        description=f"[bold green]Fetching papers via API",
+                        total=min(self.total, 1000),
+                    )
+                    p.update(task, advance=len(first_batch))
+
+                    async def wrapper(start):
+                        xml_content = await self.request_api(start, self.step)
+                        if xml_content is None:
+                            return [], None
+                        papers, _, earliest_date = self.parse_api_xml(xml_content)
+                        p.update(task, advance=len(papers))
+                        return papers, earliest_date
+
+                    # 每轮并发请求API_CONCURRENCY个批次，结果按提交日期降序排列，
+                    # 每轮结束后按顺序检查是否已经越过了目标区间，以便提前停止
+                    starts = range(self.step, min(self.total, 1000), self.step)
+                    for i in range(0, len(starts), API_CONCURRENCY):
+                        batches = await asyncio.gather(*[wrapper(start) for start in starts[i : i + API_CONCURRENCY]])
+                        finished = False
+                        for papers_batch, earliest_date in batches:
+                            self.papers.extend(papers_batch)
+                            if len(papers_batch) < self.step:
+                                finished = True
+                                break
+                            if earliest_date < (date_from - timedelta(days=PREV_DAY)):
+                                finished = True
+                                break
+                        if finished:
                             break
-                    current_start += self.step
 
         self.console.log(f"[bold green]API fetching completed. Got {len(self.papers)} papers.")
 
-        # 过滤严格区间
-        filtered_papers = []
+        # 一次遍历完成过滤：严格区间 + 只保留所有tag都以cs.开头的论文，
+        # 并按url去重(翻页时arXiv可能在相邻批次返回同一篇论文)
+        filtered_papers = {}
         for paper in self.papers:
-            if date_from <= paper.first_submitted_date <= date_until:
-                filtered_papers.append(paper)
-
+            if (
+                date_from <= paper.first_submitted_date <= date_until
+                and is_cs_only(paper.categories)
+                and paper.url not in filtered_papers
+            ):
+                filtered_papers[paper.url] = paper
+        self.papers = list(filtered_papers.values())
+        self.console.log(f"[bold green]After date and cs-only filtering: {len(self.papers)} papers.")
+
+        if not self.papers:
+            self.console.log("[bold yellow]No filtered papers found.")
+            return
         if self.trans_to:
+            self.console.log(f"[green]Translate papers to: {self.trans_to}")
             await self.translate()
-        if filtered_papers:
-            self.paper_db.add_papers(filtered_papers)
-        self.papers = filtered_papers
-        # 只保留所有tag都以cs.开头的论文
-        if filtered_papers:
-            pass
-        else:
-            self.console.log("[bold yellow]No filtered papers found.")
-
-        self.papers = [paper for paper in self.papers if paper.categories and all(cat.startswith('cs.') for cat in paper.categories)]
-        self.console.log(f"[bold green]After cs-only filtering: {len(self.papers)} papers.")
-        self.console.log(f"[green]Translate papers to: {self.trans_to}")
-        
-        
-        
+        self.paper_db.add_papers(self.papers)
 
     @property
     def meta_data(self):
@@ -367,17 +496,12 @@ class ArxivScraper(object):
         """
         return dict(repo_url="https://github.com/huiyeruzhou/arxiv_crawler", **self.__dict__)
 
-    def get_url(self, start):
+    def _build_search_terms(self):
         """
-        获取用于搜索的url
-
-        Args:
-            start (int): 返回结果的起始序号, 每个页面只会包含序号为[start, start+50)的文章
-            filter_date_by (str, optional): 日期筛选方式. Defaults to "submitted_date_first".
+        构建网页搜索url中的关键词参数, 只依赖关键词, 初始化时构建一次
         """
-        # https://arxiv.org/search/advanced?terms-0-operator=AND&terms-0-term=LLM&terms-0-field=title&terms-1-operator=OR&terms-1-term=language+model&terms-1-field=title&terms-2-operator=OR&terms-2-term=multimodal&terms-2-field=title&terms-3-operator=OR&terms-3-term=finetuning&terms-3-field=title&terms-4-operator=AND&terms-4-term=GPT&terms-4-field=title&classification-computer_science=y&classification-physics_archives=all&classification-include_cross_list=include&date-year=&date-filter_by=date_range&date-from_date=2024-08-08&date-to_date=2024-08-15&date-date_type=submitted_date_first&abstracts=show&size=50&order=submitted_date
-        
         # 构建搜索参数：必需关键词使用AND连接，可选关键词使用OR连接
+        # 关键词中可能包含&、+等特殊字符，先单独编码
         terms = []
         term_index = 0
         
@@ -385,7 +509,7 @@ class ArxivScraper(object):
         for kw in self.required_keywords:
             # 为每个必需关键词创建一个OR组（在多个字段中搜索）
             operator = "AND" if term_index > 0 else "AND"
-            terms.append(f"&terms-{term_index}-operator={operator}&terms-{term_index}-term={kw}&terms-{term_index}-field=all")
+            terms.append(f"&terms-{term_index}-operator={operator}&terms-{term_index}-term={urllib.parse.quote_plus(kw)}&terms-{term_index}-field=all")
             term_index += 1
 
         # 处理可选关键词 (二维数组，外层AND，内层OR) - 每个关键词在任意字段中存在即可
@@ -399,10 +523,22 @@ class ArxivScraper(object):
                         operator = "AND"  # 组与组之间用AND连接
                     elif i > 0:
                         operator = "OR"   # 组内用OR连接
-                    terms.append(f"&terms-{term_index}-operator={operator}&terms-{term_index}-term={kw}&terms-{term_index}-field=all")
+                    terms.append(f"&terms-{term_index}-operator={operator}&terms-{term_index}-term={urllib.parse.quote_plus(kw)}&terms-{term_index}-field=all")
                     term_index += 1
 
-        kwargs = "".join(terms)
+        return "".join(terms)
+
+    def get_url(self, start):
+        """
+        获取用于搜索的url
+
+        Args:
+            start (int): 返回结果的起始序号, 每个页面只会包含序号为[start, start+50)的文章
+            filter_date_by (str, optional): 日期筛选方式. Defaults to "submitted_date_first".
+        """
+        # https://arxiv.org/search/advanced?terms-0-operator=AND&terms-0-term=LLM&terms-0-field=title&terms-1-operator=OR&terms-1-term=language+model&terms-1-field=title&terms-2-operator=OR&terms-2-term=multimodal&terms-2-field=title&terms-3-operator=OR&terms-3-term=finetuning&terms-3-field=title&terms-4-operator=AND&terms-4-term=GPT&terms-4-field=title&classification-computer_science=y&classification-physics_archives=all&classification-include_cross_list=include&date-year=&date-filter_by=date_range&date-from_date=2024-08-08&date-to_date=2024-08-15&date-date_type=submitted_date_first&abstracts=show&size=50&order=submitted_date
+        
+        kwargs = self._search_terms
         date_from = self.search_from_date.strftime("%Y-%m")
         date_until = self.search_until_date.strftime("%Y-%m")
         return (
@@ -420,12 +556,7 @@ class ArxivScraper(object):
         url = self.get_url(start)
         while error <= 3:
             try:
-                timeout = ClientTimeout(total=30)  # 使用ClientTimeout对象
-                async with aiohttp.ClientSession(trust_env=True, timeout=timeout) as session:
-                    async with session.get(url, proxy=self.proxy) as response:
-                        response.raise_for_status()
-                        content = await response.text()
-                        return content
+                return await self._get_bytes(url)
             except Exception as e:
                 error += 1
                 self.console.log(f"[bold red]Request {start} cause error: ")
@@ -443,45 +574,47 @@ class ArxivScraper(object):
         # 获取前50篇文章并记录总数
         self.console.log(f"[bold green]Fetching the first {self.step} papers...")
         self.console.print(f"[grey] {self.get_url(0)}")
-        content = await self.request(0)
-        if content is None:
-            self.console.log("[bold red]Failed to fetch initial content, aborting...")
-            return
-        self.papers.extend(self.parse_search_html(content))
-
-        # 获取剩余的内容
-        with Progress(
-            SpinnerColumn(),
-            *Progress.get_default_columns(),
-            TimeElapsedColumn(),
-            console=self.console,
-            transient=False,
-        ) as p:  # rich进度条
-            task = p.add_task(
-                description=f"[bold green]Fetching {self.total} results",
-                total=self.total,
-            )
-            p.update(task, advance=self.step)
-
-            async def wrapper(start):  # wrapper用于显示进度
-                # 异步请求网页，并解析其中的内容
-                content = await self.request(start)
-                if content is None:
-                    return []  # 如果请求失败，返回空列表
-                papers = self.parse_search_html(content)
+        async with self._shared_session():
+            content = await self.request(0)
+            if content is None:
+                self.console.log("[bold red]Failed to fetch initial content, aborting...")
+                return
+            self.papers.extend(self.parse_search_html(content))
+
+            # 获取剩余的内容
+            with Progress(
+                SpinnerColumn(),
+                *Progress.get_default_columns(),
+                TimeElapsedColumn(),
+                console=self.console,
+                transient=False,
+            ) as p:  # rich进度条
+                task = p.add_task(
+                    description=f"[bold green]Fetching {self.total} results",
+                    total=self.total,
+                )
                 p.update(task, advance=self.step)
-                return papers
 
-            # 创建异步任务
-            fetch_tasks = []
-            for start in range(self.step, self.total, self.step):
-                fetch_tasks.append(wrapper(start))
-            papers_list = await asyncio.gather(*fetch_tasks)
-            self.papers.extend(chain(*papers_list))
+                async def wrapper(start):  # wrapper用于显示进度
+                    # 异步请求网页，并解析其中的内容
+                    content = await self.request(start)
+                    if content is None:
+                        return []  # 如果请求失败，返回空列表
+                    # 解析放到线程中执行，不阻塞事件循环中的其余请求
+                    papers = await asyncio.to_thread(self.parse_search_page, content)
+                    p.update(task, advance=self.step)
+                    return papers
+
+                # 创建异步任务
+                fetch_tasks = []
+                for start in range(self.step, self.total, self.step):
+                    fetch_tasks.append(wrapper(start))
+                papers_list = await asyncio.gather(*fetch_tasks)
+                self.papers.extend(chain(*papers_list))
 
         self.console.log(f"[bold green]Fetching completed. ")
         # 只保留所有tag都以cs.开头的论文
-        self.papers = [paper for paper in self.papers if paper.categories and all(cat.startswith('cs.') for cat in paper.categories)]
+        self.papers = [paper for paper in self.papers if is_cs_only(paper.categories)]
         if self.trans_to:
             await self.translate()
         self.process_papers()
@@ -515,12 +648,13 @@ class ArxivScraper(object):
             )
         self.console.print(f"[grey] {self.get_url(0)}")
 
-        continue_update = await self.update_async(0)
-        for start in range(self.step, self.total, self.step):
-            if not continue_update:
-                break
+        async with self._shared_session():
+            continue_update = await self.update_async(0)
+            for start in range(self.step, self.total, self.step):
+                if not continue_update:
+                    break
 
-            continue_update = await self.update_async(start)
+                continue_update = await self.update_async(start)
         self.console.log(f"[bold green]Fetching completed. {len(self.papers)} new papers.")
         if self.trans_to:
             await self.translate()
@@ -561,25 +695,24 @@ class ArxivScraper(object):
         同步版本的update，用于fetch_update方法
         """
         content = asyncio.run(self.request(start))
-        self.papers.extend(self.parse_search_html(content))
-        cnt_new = self.paper_db.count_new_papers(self.papers[start : start + self.step])
-        if cnt_new < self.step:
-            self.papers = self.papers[: start + cnt_new]
-            return False
-        else:
-            return True
+        return self._collect_new_papers(self.parse_search_html(content))
 
     async def update_async(self, start) -> bool:
         content = await self.request(start)
         if content is None:
             return False  # 如果请求失败，停止更新
-        self.papers.extend(self.parse_search_html(content))
-        cnt_new = self.paper_db.count_new_papers(self.papers[start : start + self.step])
+        return self._collect_new_papers(self.parse_search_html(content))
+
+    def _collect_new_papers(self, batch) -> bool:
+        """
+        将这一页中尚未入库的论文加入self.papers, 返回是否需要继续翻页
+        """
+        cnt_new = self.paper_db.count_new_papers(batch)
         if cnt_new < self.step:
-            self.papers = self.papers[: start + cnt_new]
+            self.papers.extend(batch[:cnt_new])
             return False
-        else:
-            return True
+        self.papers.extend(batch)
+        return True
 
     def parse_search_html(self, content) -> list[Paper]:
         """
@@ -587,7 +720,7 @@ class ArxivScraper(object):
         初次调用时, 会解析self.total
 
         Args:
-            content (str): 网页内容
+            content (bytes): 网页内容
         """
         
         # 检查content是否为None
@@ -655,8 +788,9 @@ class ArxivScraper(object):
         </li>
         """
 
-        soup = BeautifulSoup(content, "html.parser")
+        soup = BeautifulSoup(content, HTML_PARSER)
         if not self.total:
+            # 总数只在第一页读取一次，直接从已解析的soup中查找；改用lxml的XPath需要再解析一遍页面
             total = soup.select("#main-container > div.level.is-marginless > div.level-left > h1")[0].text
             # "Showing 1–50 of 2,542,002 results" or "Sorry, your query returned no results"
             if "Sorry" in total:
@@ -665,15 +799,28 @@ class ArxivScraper(object):
             total = int(total[total.find("of") + 3 : total.find("results")].replace(",", ""))
             self.total = total
 
-        results = soup.find_all("li", {"class": "arxiv-result"})
+        return self._parse_search_results(soup)
+
+    @classmethod
+    def parse_search_page(cls, content) -> list[Paper]:
+        """
+        只解析页面中的搜索结果, 不读写实例状态(self.total等), 因此可以在其他线程中执行
+
+        Args:
+            content (bytes): 网页内容
+        """
+        return cls._parse_search_results(BeautifulSoup(content, HTML_PARSER))
+
+    @classmethod
+    def _parse_search_results(cls, soup) -> list[Paper]:
         papers = []
-        for result in results:
+        for result in soup.find_all("li", {"class": "arxiv-result"}):
 
             url_tag = result.find("a")
             url = url_tag["href"] if url_tag else "No link"
 
             title_tag = result.find("p", class_="title")
-            title = self.parse_search_text(title_tag) if title_tag else "No title"
+            title = cls.parse_search_text(title_tag) if title_tag else "No title"
             title = title.strip()
 
             date_tag = result.find("p", class_="is-size-7")
@@ -698,7 +845,7 @@ class ArxivScraper(object):
             authors = authors_tag.get_text(strip=True)[len("Authors:") :] if authors_tag else "No authors"
 
             summary_tag = result.find("span", class_="abstract-full")
-            abstract = self.parse_search_text(summary_tag) if summary_tag else "No summary"
+            abstract = cls.parse_search_text(summary_tag) if summary_tag else "No summary"
             abstract = abstract.strip()
 
             comments_tag = result.find("p", class_="comments")
@@ -708,7 +855,7 @@ class ArxivScraper(object):
                 Paper(
                     url=url,
                     title=title,
-                    first_submitted_date=datetime.strptime(date, "%d %B, %Y"),
+                    first_submitted_date=parse_search_date(date),
                     categories=categories,
                     authors=authors,
                     abstract=abstract,
@@ -717,19 +864,21 @@ class ArxivScraper(object):
             )
         return papers
 
-    def parse_search_text(self, tag):
-        string = ""
+    @staticmethod
+    def parse_search_text(tag):
+        # 先收集各片段再一次性拼接并压缩空白，避免字符串反复+=
+        parts = []
         for child in tag.children:
             if isinstance(child, NavigableString):
-                string += re.sub(r"\s+", " ", child)
+                parts.append(child)
             elif isinstance(child, Tag):
-                if child.name == "span" and "search-hit" in child.get("class"):
-                    string += re.sub(r"\s+", " ", child.get_text(strip=False))
-                elif child.name == "a" and ".style.display" in child.get("onclick"):
+                if child.name == "span" and "search-hit" in child.get("class", ()):
+                    parts.append(child.get_text(strip=False))
+                elif child.name == "a" and ".style.display" in (child.get("onclick") or ""):
                     pass
                 else:
                     print(f"出现了unexpected情况, child:{child}")
-        return string
+        return _WS_RE.sub(" ", "".join(parts))
 
     async def translate(self):
         if not self.trans_to:
@@ -748,11 +897,28 @@ class ArxivScraper(object):
                 total=total,
             )
 
-            async def worker(paper):
-                await paper.translate(langto=self.trans_to)
-                p.update(task, advance=1)
-
-            await asyncio.gather(*[worker(paper) for paper in self.papers])
+            # 所有翻译请求共用一个连接池，并由信号量限制同时进行的请求数
+            sem = asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+
+            async def worker(papers, session):
+                # 标题和摘要分别批量翻译(已翻译过的文本直接取缓存)，每组只需少量请求
+                titles, abstracts = await asyncio.gather(
+                    self.paper_db.translate_texts(
+                        [paper.title for paper in papers], langto=self.trans_to, session=session, sem=sem
+                    ),
+                    self.paper_db.translate_texts(
+                        [paper.abstract for paper in papers], langto=self.trans_to, session=session, sem=sem
+                    ),
+                )
+                for paper, title, abstract in zip(papers, titles, abstracts):
+                    paper.title_translated = title
+                    paper.abstract_translated = abstract
+                p.update(task, advance=len(papers))
+
+            async with new_translate_session() as session:
+                await asyncio.gather(
+                    *[worker(self.papers[i : i + TRANSLATE_BATCH], session) for i in range(0, total, TRANSLATE_BATCH)]
+                )
 
     def to_markdown(self, output_dir="./output_llms", filename_format="%Y-%m-%d", meta=False):
         self.paper_exporter.to_markdown(output_dir, filename_format, self.meta_data if meta else None)
@@ -780,9 +946,6 @@ async def get_daily_llm_papers(date_from=None, date_until=None, translate=True,
     Returns:
         list[Paper]: 获取到的论文列表
     """
-    from datetime import date, datetime
-    import asyncio
-
     if date_from is None:
         date_from = date.today().strftime("%Y-%m-%d")
     if date_until is None:
@@ -848,14 +1011,10 @@ async def get_daily_llm_papers(date_from=None, date_until=None, translate=True,
     print(f"抓取到的总paper数量:{len(papers)}")
     if papers:
         return papers
-    target_papers = db.search_papers_by_keywords(
-        required_keywords=required_keywords,
-        optional_keywords=optional_keywords,
-        date_from=date_from,
-        date_until=date_until
-    )
+    # 没有抓取到论文时数据库不会有新增，同一区间的查询结果就是开头的existing_papers(为空)，不再重复查询
+    target_papers = existing_papers
     print(f"指定日期 {date_from} - {date_until} 包含指定关键词的paper数量:{len(target_papers)}")
-    if not target_papers and date_from == date_until:
+    if date_from == date_until:
         print(f"搜索时间范围扩大为：{date_from_datetime - timedelta(days=PREV_DAY)} - {date_until}")
         target_papers = db.search_papers_by_keywords(
             required_keywords=required_keywords,
@@ -871,7 +1030,6 @@ async def update_daily_cs_paper():
     """
     更新计算机论文到数据库
     """
-    from datetime import date
     today = date.today()
     scraper = ArxivScraper(
         date_from=today.strftime("%Y-%m-%d"),
@@ -880,8 +1038,6 @@ async def update_daily_cs_paper():
     await scraper.fetch_update()
 
 if __name__ == "__main__":
-    from datetime import date, timedelta
-
     today = date.today()
 
     scraper = ArxivScraper(
@@ -1,4 +1,5 @@
 import asyncio
+import urllib.parse
 
 import aiohttp
 import requests
@@ -68,64 +69,138 @@ def TL(a):
     return str(a) + jd + str(int(a) ^ int(b))
 
 
-async def async_google_translate(data, url="https://translate.googleapis.com", proxy=None):
+TRANSLATE_CONCURRENCY = 8  # 同时进行的翻译请求数上限，过多的并发会被翻译接口限流
+
+
+def new_translate_session(limit=TRANSLATE_CONCURRENCY):
+    """
+    创建翻译用的session, 连接池大小与并发上限一致, 多个请求复用同一组连接
+    """
+    return aiohttp.ClientSession(trust_env=True, connector=aiohttp.TCPConnector(limit=limit))
+
+
+async def async_google_translate(data, url="https://translate.googleapis.com", proxy=None, session=None):
     """
     参考zotero翻译插件的代码
     https://github.com/windingwind/zotero-pdf-translate/blob/main/src/modules/services/google.ts
+
+    传入session时复用该session, 否则为这次翻译单独创建一个
     """
+    if session is None:
+        async with new_translate_session() as session:
+            return await async_google_translate(data, url=url, proxy=proxy, session=session)
+
     error = 0
     while error <= 3:
         try:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(
-                    f"{data.secret if data.secret else url}/translate_a/single",
-                    proxy=proxy,
-                    params={
-                        "client": "gtx",
-                        "hl": "zh-CN",
-                        "dt": [
-                            "at",
-                            "bd",
-                            "ex",
-                            "ld",
-                            "md",
-                            "qca",
-                            "rw",
-                            "rm",
-                            "ss",
-                            "t",
-                        ],
-                        "source": "bh",
-                        "ssel": "0",
-                        "tsel": "0",
-                        "kc": "1",
-                        "tk": TL(data.raw),
-                        "q": data.raw,
-                        "sl": data.langfrom,
-                        "tl": data.langto,
-                    },
-                ) as response:
-                    response.raise_for_status()
-
-                    result = ""
-                    json_response = await response.json()
-                    for item in json_response[0]:
-                        if item and item[0]:
-                            result += item[0]
-
-                    data.result = result
-                return
+            async with session.get(
+                f"{data.secret if data.secret else url}/translate_a/single",
+                proxy=proxy,
+                params={
+                    "client": "gtx",
+                    "hl": "zh-CN",
+                    "dt": [
+                        "at",
+                        "bd",
+                        "ex",
+                        "ld",
+                        "md",
+                        "qca",
+                        "rw",
+                        "rm",
+                        "ss",
+                        "t",
+                    ],
+                    "source": "bh",
+                    "ssel": "0",
+                    "tsel": "0",
+                    "kc": "1",
+                    "tk": TL(data.raw),
+                    "q": data.raw,
+                    "sl": data.langfrom,
+                    "tl": data.langto,
+                },
+            ) as response:
+                response.raise_for_status()
+
+                result = ""
+                json_response = await response.json()
+                for item in json_response[0]:
+                    if item and item[0]:
+                        result += item[0]
+
+                data.result = result
+            return
         except Exception as e:
             error += 1
             pass
 
 
-async def async_translate(text, langto="zh-CN", proxy=None):
+async def async_translate(text, langto="zh-CN", proxy=None, *, session=None, sem=None):
+    """
+    session: 复用的翻译session; sem: 限制并发请求数的信号量, 两者都可省略
+    """
     task = TranslateTask(raw=text, langto=langto)
-    await async_google_translate(task, proxy=proxy)
+    if sem is None:
+        await async_google_translate(task, proxy=proxy, session=session)
+    else:
+        async with sem:
+            await async_google_translate(task, proxy=proxy, session=session)
     return task.result
 
 
+BATCH_SEPARATOR = "\n"  # 批量翻译时分隔各段文本的换行，翻译结果按行保留，各段文本内部的换行会先替换为空格
+BATCH_MAX_QUERY_BYTES = 4000  # 每组文本URL编码后的长度上限，文本放在GET请求的q参数中，需要给URL长度留出余量
+
+
+def _split_batches(texts, max_bytes=BATCH_MAX_QUERY_BYTES):
+    """
+    按URL编码后的长度上限将文本分组，返回每组文本在texts中的下标
+    """
+    batch, size = [], 0
+    for i, text in enumerate(texts):
+        length = len(urllib.parse.quote_plus(text)) + len(urllib.parse.quote_plus(BATCH_SEPARATOR))
+        if batch and size + length > max_bytes:
+            yield batch
+            batch, size = [], 0
+        batch.append(i)
+        size += length
+    if batch:
+        yield batch
+
+
+async def async_translate_batch(texts, langto="zh-CN", proxy=None, *, session=None, sem=None):
+    """
+    将多段文本逐行拼接后批量翻译，减少请求次数
+    如果某一组翻译结果的行数与原文不一致，则该组退回逐条翻译
+    未传入session/sem时，本次调用内的请求共用一个session，并发数不超过TRANSLATE_CONCURRENCY
+    """
+    if session is None:
+        async with new_translate_session() as session:
+            return await async_translate_batch(texts, langto=langto, proxy=proxy, session=session, sem=sem)
+    if sem is None:
+        sem = asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+
+    # 每段文本压成一行，分隔符不会出现在文本内部
+    texts = [" ".join(text.splitlines()) for text in texts]
+    results = [None] * len(texts)
+
+    async def worker(indices):
+        joined = BATCH_SEPARATOR.join(texts[i] for i in indices)
+        translated = await async_translate(joined, langto=langto, proxy=proxy, session=session, sem=sem)
+        parts = [part.strip() for part in translated.strip().split(BATCH_SEPARATOR)] if translated else []
+        # 只有一段时逐条翻译就是重新请求一次，不再重复
+        if len(parts) != len(indices) and len(indices) > 1:
+            parts = await asyncio.gather(
+                *[async_translate(texts[i], langto=langto, proxy=proxy, session=session, sem=sem) for i in indices]
+            )
+        for i, part in zip(indices, parts):
+            results[i] = part
+
+    await asyncio.gather(*[worker(indices) for indices in _split_batches(texts)])
+    return results
+
+
 def google_translate(data, url="https://translate.googleapis.com", proxy=None):
     response = requests.get(
         f"{data.secret if data.secret else url}/translate_a/single",
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from bs4 import Tag
 from typing_extensions import Literal
 
@@ -226,23 +228,26 @@ CATS_MAP = {
 }
 
 
+@lru_cache(maxsize=512)
+def _parse_categories(categories: tuple, lang: str) -> tuple:
+    return tuple(
+        # 如果分类不在映射中或者没有对应语言版本，返回原分类名称
+        CATS_MAP[category][lang] if category in CATS_MAP and lang in CATS_MAP[category] else category
+        for category in categories
+    )
+
+
 def parse_categories(categories, lang: Literal["zh-CN", "en"] = "zh-CN"):
     """
     将arxiv的分类转换为对应语言的版本。
     如果分类不在CATS_MAP中，返回原分类名称
+    结果按(分类元组, 语言)缓存，导出时同一组分类只解析一次；每次调用都返回新的列表，修改它不会影响缓存
 
     Args:
-        categories (list): 分类列表
+        categories (Iterable[str]): 分类列表或元组(会被转换为元组作为缓存键)
         lang (str, optional): 目标语言. Defaults to "zh-CN".
     """
-    result = []
-    for category in categories:
-        if category in CATS_MAP and lang in CATS_MAP[category]:
-            result.append(CATS_MAP[category][lang])
-        else:
-            # 如果分类不在映射中或者没有对应语言版本，返回原分类名称
-            result.append(category)
-    return result
+    return list(_parse_categories(tuple(categories), lang))
 
 
 if __name__ == "__main__":
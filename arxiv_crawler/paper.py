@@ -1,8 +1,10 @@
 import asyncio
 import csv
+import hashlib
+import re
 import sqlite3
 from collections import defaultdict
-from dataclasses import dataclass, fields
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -16,16 +18,26 @@ except ImportError:
 from rich.console import Console
 from typing_extensions import Iterable
 
-from async_translator import async_translate
+from async_translator import TRANSLATE_CONCURRENCY, async_translate_batch, new_translate_session
 from categories import parse_categories
 
+# 可以通过FTS5 trigram索引做子串匹配的关键词: 至少3个字符(trigram无法匹配更短的子串)，
+# 且只含字母数字、空白和连字符(LIKE中'_'和'%'是通配符，两种查询的结果会不一致)，其余退回LIKE查询
+_FTS_KEYWORD_RE = re.compile(r"(?:[^\W_]|[\s-]){3,}")
 
+# 单条IN查询中的参数个数上限，低于SQLITE_MAX_VARIABLE_NUMBER的默认值
+MAX_SQL_VARIABLES = 500
 
-@dataclass
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass(slots=True)
 class Paper:
     first_submitted_date: datetime
     title: str
-    categories: list
+    categories: tuple
     url: str
     authors: str
     abstract: str
@@ -33,11 +45,21 @@ class Paper:
     title_translated: str | None = None
     abstract_translated: str | None = None
     first_announced_date: datetime | None = None
+    # 由url派生的链接，构造时计算一次，导出时直接读取
+    papers_cool_url: str = field(init=False, repr=False, compare=False)
+    pdf_url: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # 领域在构造后不再修改，统一存为元组，可以直接作为缓存的键
+        self.categories = tuple(self.categories)
+        self.papers_cool_url = self.url.replace("https://arxiv.org/abs", "https://papers.cool/arxiv")
+        self.pdf_url = self.url.replace("https://arxiv.org/abs", "https://arxiv.org/pdf")
 
     @classmethod
     def from_row(cls, row: sqlite3.Row):
         return cls(
-            first_submitted_date=datetime.strptime(row["first_submitted_date"], "%Y-%m-%d"),
+            # fromisoformat由C实现，比strptime快得多
+            first_submitted_date=datetime.fromisoformat(row["first_submitted_date"]),
             title=row["title"],
             categories=row["categories"].split(","),
             url=row["url"],
@@ -46,15 +68,8 @@ class Paper:
             comments=row["comments"],
             title_translated=row["title_translated"],
             abstract_translated=row["abstract_translated"],
-            first_announced_date=datetime.strptime(row["first_announced_date"], "%Y-%m-%d"),
+            first_announced_date=datetime.fromisoformat(row["first_announced_date"]),
         )
-    @property
-    def papers_cool_url(self):
-        return self.url.replace("https://arxiv.org/abs", "https://papers.cool/arxiv")
-    
-    @property
-    def pdf_url(self):
-        return self.url.replace("https://arxiv.org/abs", "https://arxiv.org/pdf")
 
     def to_markdown(self):
         categories = ",".join(parse_categories(self.categories))
@@ -77,8 +92,13 @@ class Paper:
 """
 
     async def translate(self, langto="zh-CN"):
-        self.title_translated = await async_translate(self.title, langto=langto)
-        self.abstract_translated = await async_translate(self.abstract, langto=langto)
+        self.title_translated, self.abstract_translated = await async_translate_batch(
+            [self.title, self.abstract], langto=langto
+        )
+
+
+# papers表中对应Paper的列数(不含构造后派生的字段)
+PAPER_COLUMN_COUNT = sum(1 for f in fields(Paper) if f.init)
 
 
 @dataclass
@@ -100,17 +120,71 @@ class PaperDatabase:
     def __init__(self, db_path="papers.db"):
         self.conn = sqlite3.connect(db_path)
         self.conn.row_factory = self._row_factory
+        # WAL模式下读写可以并发, synchronous=NORMAL每次提交不再fsync两次
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA temp_store = MEMORY")
+        self.conn.execute("PRAGMA cache_size = -65536")  # 64MB页缓存
+        # add_papers使用INSERT OR REPLACE, 只有开启递归触发器时被替换的行才会触发删除触发器, FTS索引才不会残留旧内容
+        self.conn.execute("PRAGMA recursive_triggers = ON")
         self._create_table()
+        self._has_fts = self._create_fts()
 
     @staticmethod
     def _row_factory(cursor, row):
         row = sqlite3.Row(cursor, row)
         # all fields in Paper, plus `update_time`
-        if len(row.keys()) == len(fields(Paper)) + 1:
+        if len(row.keys()) == PAPER_COLUMN_COUNT + 1:
             return Paper.from_row(row)
         else:
             return row
 
+    def _create_fts(self) -> bool:
+        """
+        创建标题和摘要的FTS5全文索引(外部内容表, 由触发器与papers保持同步)
+        使用trigram分词，MATCH与LIKE '%kw%'一样是不区分大小写的子串匹配(如GPT能匹配ChatGPT)
+        首次创建时会为已有数据建立索引; 当前sqlite不支持FTS5或trigram分词(需要3.34+)时返回False
+        """
+        try:
+            with self.conn:
+                row = self.conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'papers_fts'"
+                ).fetchone()
+                exists = row is not None and "trigram" in row["sql"]
+                if row is not None and not exists:
+                    # 旧版本按词分词建立的索引只能做词前缀匹配，删除后按trigram重建
+                    self.conn.executescript(
+                        """
+                        DROP TRIGGER IF EXISTS papers_ai;
+                        DROP TRIGGER IF EXISTS papers_ad;
+                        DROP TRIGGER IF EXISTS papers_au;
+                        DROP TABLE papers_fts;
+                        """
+                    )
+                self.conn.executescript(
+                    """
+                    CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts
+                        USING fts5(title, abstract, content='papers', content_rowid='rowid', tokenize='trigram');
+                    CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN
+                        INSERT INTO papers_fts(rowid, title, abstract) VALUES (new.rowid, new.title, new.abstract);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN
+                        INSERT INTO papers_fts(papers_fts, rowid, title, abstract)
+                            VALUES ('delete', old.rowid, old.title, old.abstract);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE OF title, abstract ON papers BEGIN
+                        INSERT INTO papers_fts(papers_fts, rowid, title, abstract)
+                            VALUES ('delete', old.rowid, old.title, old.abstract);
+                        INSERT INTO papers_fts(rowid, title, abstract) VALUES (new.rowid, new.title, new.abstract);
+                    END;
+                    """
+                )
+                if not exists:
+                    self.conn.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
     def _create_table(self):
         with self.conn:
             self.conn.execute(
@@ -130,9 +204,31 @@ class PaperDatabase:
                 )
             """
             )
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    hash TEXT NOT NULL,
+                    lang TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY (hash, lang)
+                )
+            """
+            )
+            # 按首次公布日期查询/删除/统计都走这个索引, update_time放在第二列供newest_update_time使用
+            index_exists = self.conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_papers_announced'"
+            ).fetchone()
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_papers_announced ON papers(first_announced_date, update_time)"
+            )
+            if not index_exists:
+                # 首次建索引后收集一次统计信息，让查询规划器在日期范围查询中选用索引
+                self.conn.execute("ANALYZE papers")
 
     def add_papers(self, papers: Iterable[Paper]):
-        assert all([paper.first_announced_date is not None for paper in papers])
+        assert all(paper.first_announced_date is not None for paper in papers)
+        # 同一批论文共用一个写入时间；date().isoformat()直接输出YYYY-MM-DD，比strftime快
+        now = datetime.now(UTC).replace(tzinfo=None)
         with self.conn:
             data_to_insert = [
                 (
@@ -141,12 +237,12 @@ class PaperDatabase:
                     paper.abstract,
                     paper.title,
                     ",".join(paper.categories),
-                    paper.first_submitted_date.strftime("%Y-%m-%d"),
-                    paper.first_announced_date.strftime("%Y-%m-%d"),
+                    paper.first_submitted_date.date().isoformat(),
+                    paper.first_announced_date.date().isoformat(),
                     paper.title_translated,
                     paper.abstract_translated,
                     paper.comments,
-                    datetime.now(UTC).replace(tzinfo=None)
+                    now,
                 )
                 for paper in papers
             ]
@@ -160,19 +256,23 @@ class PaperDatabase:
             )
 
     def count_new_papers(self, papers: Iterable[Paper]) -> int:
+        """
+        统计papers开头连续的、尚未入库的论文数量(遇到第一篇已入库的论文即停止)
+        """
+        urls = [paper.url for paper in papers]
+        found = set()
+        for i in range(0, len(urls), MAX_SQL_VARIABLES):
+            chunk = urls[i : i + MAX_SQL_VARIABLES]
+            cursor = self.conn.execute(
+                f"SELECT url FROM papers WHERE url IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update(row["url"] for row in cursor)
         cnt = 0
-        for paper in papers:
-            with self.conn:
-                cursor = self.conn.execute(
-                    """
-                    SELECT * FROM papers WHERE url = ?
-                    """,
-                    (paper.url,),
-                )
-                if cursor.fetchone():
-                    break
-                else:
-                    cnt += 1
+        for url in urls:
+            if url in found:
+                break
+            cnt += 1
         return cnt
 
     def fetch_papers_on_date(self, date: datetime) -> list[Paper]:
@@ -203,26 +303,16 @@ class PaperDatabase:
         else:
             raise ValueError("date 参数必须是字符串 'YYYY-MM-DD' 或 datetime 对象")
         
-        # 先查询有多少篇论文会被删除
+        # 直接删除，删除的行数由rowcount给出(不含FTS触发器的改动)，无需先COUNT一遍
         with self.conn:
             cursor = self.conn.execute(
-                """
-                SELECT COUNT(*) as count FROM papers WHERE first_announced_date = ?
-                """,
-                (date_str,),
-            )
-            count = cursor.fetchone()["count"]
-        
-        # 执行删除
-        with self.conn:
-            self.conn.execute(
                 """
                 DELETE FROM papers WHERE first_announced_date = ?
                 """,
                 (date_str,),
             )
         
-        return count
+        return cursor.rowcount
 
     def delete_papers_in_date_range(self, start_date, end_date) -> int:
         """
@@ -251,20 +341,9 @@ class PaperDatabase:
         else:
             raise ValueError("end_date 参数必须是字符串 'YYYY-MM-DD' 或 datetime 对象")
         
-        # 先查询有多少篇论文会被删除
+        # 直接删除，删除的行数由rowcount给出(不含FTS触发器的改动)，无需先COUNT一遍
         with self.conn:
             cursor = self.conn.execute(
-                """
-                SELECT COUNT(*) as count FROM papers 
-                WHERE first_announced_date BETWEEN ? AND ?
-                """,
-                (start_str, end_str),
-            )
-            count = cursor.fetchone()["count"]
-        
-        # 执行删除
-        with self.conn:
-            self.conn.execute(
                 """
                 DELETE FROM papers 
                 WHERE first_announced_date BETWEEN ? AND ?
@@ -272,7 +351,7 @@ class PaperDatabase:
                 (start_str, end_str),
             )
         
-        return count
+        return cursor.rowcount
 
     def fetch_all(self) -> list[Paper]:
         with self.conn:
@@ -299,6 +378,53 @@ class PaperDatabase:
         time = cursor.fetchone()["max_updated_time"].split(".")[0]
         return datetime.strptime(time, "%Y-%m-%d %H:%M:%S")
 
+    async def translate_texts(self, texts: list[str], langto="zh-CN", *, session=None, sem=None) -> list[str | None]:
+        """
+        带缓存的批量翻译：先查询translations表，未命中的文本才会请求翻译，相同的文本只翻译一次
+        查到和翻译出的结果只在本次调用内缓存，跨调用的缓存由translations表负责，常驻进程的内存不会随翻译量增长
+
+        Args:
+            texts: 待翻译的文本, 空文本直接返回None
+            langto: 目标语言
+            session: 复用的翻译session, 见async_translator.new_translate_session
+            sem: 限制并发翻译请求数的信号量
+
+        Returns:
+            list[str | None]: 与texts一一对应的翻译结果, 翻译失败为None
+        """
+        keys = [text_hash(text) if text else None for text in texts]
+        # 本次调用的翻译缓存: 文本哈希 -> 译文
+        cache: dict[str, str] = {}
+
+        unique_keys = list({key for key in keys if key})
+        if unique_keys:
+            with self.conn:
+                for i in range(0, len(unique_keys), MAX_SQL_VARIABLES):
+                    chunk = unique_keys[i : i + MAX_SQL_VARIABLES]
+                    cursor = self.conn.execute(
+                        f"SELECT hash, text FROM translations WHERE lang = ? AND hash IN ({','.join('?' * len(chunk))})",
+                        (langto, *chunk),
+                    )
+                    for row in cursor.fetchall():
+                        cache[row["hash"]] = row["text"]
+
+        todo = {}
+        for key, text in zip(keys, texts):
+            if key and key not in cache:
+                todo.setdefault(key, text)
+        if todo:
+            translated = await async_translate_batch(list(todo.values()), langto=langto, session=session, sem=sem)
+            new_rows = [(key, langto, result) for key, result in zip(todo, translated) if result]
+            for key, _, result in new_rows:
+                cache[key] = result
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO translations (hash, lang, text) VALUES (?, ?, ?)",
+                    new_rows,
+                )
+
+        return [cache.get(key) if key else None for key in keys]
+
     async def translate_missing(self, langto="zh-CN"):
         with self.conn:
             cursor = self.conn.execute(
@@ -306,16 +432,41 @@ class PaperDatabase:
             )
             papers = cursor.fetchall()
 
-        async def worker(url, title, abstract):
-            title_translated = await async_translate(title, langto=langto) if title else None
-            abstract_translated = await async_translate(abstract, langto=langto) if abstract else None
-            with self.conn:
-                self.conn.execute(
-                    "UPDATE papers SET title_translated = ?, abstract_translated = ? WHERE url = ?",
-                    (title_translated, abstract_translated, url),
-                )
+        # 标题和摘要共用一个session和并发上限
+        sem = asyncio.Semaphore(TRANSLATE_CONCURRENCY)
+        async with new_translate_session() as session:
+            titles, abstracts = await asyncio.gather(
+                self.translate_texts([title for _, title, _ in papers], langto=langto, session=session, sem=sem),
+                self.translate_texts([abstract for _, _, abstract in papers], langto=langto, session=session, sem=sem),
+            )
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE papers SET title_translated = ?, abstract_translated = ? WHERE url = ?",
+                [(title, abstract, url) for (url, _, _), title, abstract in zip(papers, titles, abstracts)],
+            )
+
+    @staticmethod
+    def _build_fts_query(required_keywords: list[str], optional_keywords: list[list[str]]) -> str | None:
+        """
+        将关键词转换为FTS5的MATCH表达式: 必需关键词之间AND, 可选关键词组内OR、组间AND
+        每个关键词作为一个短语(如"language model")，在trigram索引上等价于LIKE '%kw%'的子串匹配
+        有关键词不足3个字符或含有标点时返回None，由调用方退回LIKE查询
+
+        Returns:
+            str | None: MATCH表达式, 没有关键词或无法转换时为None
+        """
+        def phrase(keyword):
+            return f'"{keyword}"'
+
+        keywords = list(required_keywords) + [kw for group in optional_keywords for kw in group]
+        if not keywords or not all(_FTS_KEYWORD_RE.fullmatch(kw) for kw in keywords):
+            return None
 
-        await asyncio.gather(*[worker(url, title, abstract) for url, title, abstract in papers])
+        parts = [phrase(kw) for kw in required_keywords]
+        for keyword_group in optional_keywords:
+            if keyword_group:
+                parts.append("(" + " OR ".join(phrase(kw) for kw in keyword_group) + ")")
+        return " AND ".join(parts)
 
     def search_papers_by_keywords(self, 
                                    required_keywords: list[str] = None, 
@@ -348,11 +499,19 @@ class PaperDatabase:
         conditions = []
         params = []
         
+        fts_query = self._build_fts_query(required_keywords, optional_keywords) if self._has_fts else None
+        if fts_query:
+            # 通过FTS5倒排索引匹配关键词，避免对全表做LIKE扫描
+            conditions.append("rowid IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH ?)")
+            params.append(fts_query)
+            required_keywords = []
+            optional_keywords = []
+        
         # 处理必需关键词 (AND关系)
         for keyword in required_keywords:
             field_conditions = []
-            for field in search_fields:
-                field_conditions.append(f"{field} LIKE ?")
+            for column in search_fields:
+                field_conditions.append(f"{column} LIKE ?")
                 params.append(f"%{keyword}%")
             if field_conditions:
                 conditions.append(f"({' OR '.join(field_conditions)})")
@@ -364,8 +523,8 @@ class PaperDatabase:
                     group_conditions = []
                     for keyword in keyword_group:
                         field_conditions = []
-                        for field in search_fields:
-                            field_conditions.append(f"{field} LIKE ?")
+                        for column in search_fields:
+                            field_conditions.append(f"{column} LIKE ?")
                             params.append(f"%{keyword}%")
                         if field_conditions:
                             group_conditions.append(f"({' OR '.join(field_conditions)})")
@@ -414,8 +573,8 @@ class PaperDatabase:
         field_conditions = []
         params = []
         
-        for field in search_fields:
-            field_conditions.append(f"{field} LIKE ?")
+        for column in search_fields:
+            field_conditions.append(f"{column} LIKE ?")
             params.append(f"%{search_text}%")
         
         where_clause = " OR ".join(field_conditions)
@@ -466,20 +625,22 @@ class PaperExporter:
         self.date_from = datetime.strptime(date_from, "%Y-%m-%d")
         self.date_until = datetime.strptime(date_until, "%Y-%m-%d")
         self.date_range_days = (self.date_until - self.date_from).days + 1
-        self.categories_blacklist = set(categories_blacklist)
-        self.categories_whitelist = set(categories_whitelist)
+        self.categories_blacklist = frozenset(categories_blacklist)
+        self.categories_whitelist = frozenset(categories_whitelist)
         self.console = Console()
 
     def filter_papers(self, papers: list[Paper]) -> tuple[list[PaperRecord], list[PaperRecord]]:
         filtered_paper_records = []
         chosen_paper_records = []
         print(f"白名单类别: {self.categories_whitelist}")
+        whitelist, blacklist = self.categories_whitelist, self.categories_blacklist
+        # 每篇论文只有少数几个领域，直接逐个判断成员，不必为每篇论文构造集合
         for paper in papers:
-            categories = set(paper.categories)
-            if not (self.categories_whitelist & categories):
+            categories = paper.categories
+            if not any(c in whitelist for c in categories):
                 categories_str = ",".join(categories)
                 filtered_paper_records.append(PaperRecord(paper, f"none of {categories_str} in whitelist"))
-            elif black := self.categories_blacklist & categories:
+            elif black := [c for c in categories if c in blacklist]:
                 black_str = ",".join(black)
                 filtered_paper_records.append(PaperRecord(paper, f"cat:{black_str} in blacklist"))
             else:
@@ -511,7 +672,11 @@ class PaperExporter:
             with open(output_dir / f"{current_filename}.md", "w", encoding="utf-8") as file:
                 papers = self.db.fetch_papers_on_date(current)
                 chosen_records, filtered_records = self.filter_papers(papers)
-                papers_str = f"# 论文全览：{current_filename}\n\n共有{len(chosen_records)}篇相关领域论文, 另有{len(filtered_records)}篇其他\n\n"
+                # 各段先写入列表，最后一次性拼接写入文件，避免字符串反复+=
+                parts = [
+                    preface_str,
+                    f"# 论文全览：{current_filename}\n\n共有{len(chosen_records)}篇相关领域论文, 另有{len(filtered_records)}篇其他\n\n",
+                ]
 
                 chosen_dict = defaultdict(list)
                 for record in chosen_records:
@@ -519,46 +684,60 @@ class PaperExporter:
                 for category in sorted(chosen_dict.keys()):
                     category_en = parse_categories([category], lang="en")[0]
                     category_zh = parse_categories([category], lang="zh-CN")[0]
-                    papers_str += f"## {category_zh}({category}:{category_en})\n\n"
-                    for record in chosen_dict[category]:
-                        papers_str += record.to_markdown()
+                    parts.append(f"## {category_zh}({category}:{category_en})\n\n")
+                    parts.extend(record.to_markdown() for record in chosen_dict[category])
 
-                papers_str += "## 其他论文\n\n"
-                for record in filtered_records:
-                    papers_str += record.to_markdown()
+                parts.append("## 其他论文\n\n")
+                parts.extend(record.to_markdown() for record in filtered_records)
 
-                file.write(preface_str + papers_str)
+                file.write("".join(parts))
 
             self.console.log(
                 f"[bold green]Output {current_filename}.md completed. {len(chosen_records)} papers chosen, {len(filtered_records)} papers filtered"
             )
 
+    CSV_HEADERS = (
+        "Title",
+        "Interest",
+        "Title Translated",
+        "Categories",
+        "Authors",
+        "URL",
+        "PapersCool",
+        "First Submitted Date",
+        "First Announced Date",
+        "Abstract",
+        "Abstract Translated",
+        "Comments",
+        "Note",
+    )
+
+    @staticmethod
+    def _csv_row(record: PaperRecord) -> tuple:
+        """
+        一条记录对应的CSV行, 各列顺序与CSV_HEADERS一致
+        """
+        paper = record.paper
+        return (
+            paper.title,
+            "chosen" if record.comment == "-" else "filtered",
+            paper.title_translated or "-",
+            ",".join(paper.categories),
+            paper.authors,
+            paper.url,
+            paper.papers_cool_url,
+            paper.first_submitted_date.date().isoformat(),
+            paper.first_announced_date.date().isoformat(),
+            paper.abstract,
+            paper.abstract_translated or "-",
+            paper.comments,
+            record.comment,
+        )
+
     def to_csv(self, output_dir="./output_llms", filename_format="%Y-%m-%d", header=True, csv_config={}):
         output_dir = Path(output_dir)
         output_dir.mkdir(exist_ok=True, parents=True)
 
-        csv_table = {
-            "Title": lambda record: record.paper.title,
-            "Interest": lambda record: ("chosen" if record.comment == "-" else "filtered"),
-            "Title Translated": lambda record: (
-                record.paper.title_translated if record.paper.title_translated else "-"
-            ),
-            "Categories": lambda record: ",".join(record.paper.categories),
-            "Authors": lambda record: record.paper.authors,
-            "URL": lambda record: record.paper.url,
-            "PapersCool": lambda record: record.paper.url.replace("https://arxiv.org/abs", "https://papers.cool/arxiv"),
-            "First Submitted Date": lambda record: record.paper.first_submitted_date.strftime("%Y-%m-%d"),
-            "First Announced Date": lambda record: record.paper.first_announced_date.strftime("%Y-%m-%d"),
-            "Abstract": lambda record: record.paper.abstract,
-            "Abstract Translated": lambda record: (
-                record.paper.abstract_translated if record.paper.abstract_translated else "-"
-            ),
-            "Comments": lambda record: record.paper.comments,
-            "Note": lambda record: record.comment,
-        }
-
-        headers = list(csv_table.keys())
-
         for i in range(self.date_range_days):
             current = self.date_from + timedelta(days=i)
             current_filename = current.strftime(filename_format)
@@ -568,13 +747,12 @@ class PaperExporter:
                     csv_config["lineterminator"] = "\n"
                 writer = csv.writer(file, **csv_config)
                 if header:
-                    writer.writerow(headers)
+                    writer.writerow(self.CSV_HEADERS)
 
                 papers = self.db.fetch_papers_on_date(current)
                 self.console.log(f"目标日期含有论文:{len(papers)}")
                 chosen_records, filtered_records = self.filter_papers(papers)
-                for record in chosen_records + filtered_records:
-                    writer.writerow([fn(record) for fn in csv_table.values()])
+                writer.writerows(map(self._csv_row, chosen_records + filtered_records))
 
                 self.console.log(
                     f"[bold green]Output {current_filename}.csv completed. {len(chosen_records)} papers chosen, {len(filtered_records)} papers filtered"
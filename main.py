@@ -1,17 +1,100 @@
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+import string
+import threading
 import lark_oapi as lark
 from lark_oapi.api.im.v1 import *
 import json
+from datetime import date, datetime, timedelta
 from lark_oapi.event.callback.model.p2_card_action_trigger import (
     P2CardActionTrigger,
     P2CardActionTriggerResponse,
 )
-from apscheduler.schedulers.background import BackgroundScheduler
-import uuid
-from manager.chat_manager import ChatManager, ChatConfig
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+import itertools
+import os
+import time
+from pathlib import Path
+from manager.chat_manager import ChatManager, ChatConfig, ChatPapers
 
 # 全局配置
 NEW_PAPER_CARD_VERSION = "1.0.4"
 PREV_DAY = 4  # 检查过去时间的范围（天数）
+DAILY_SEND_CONCURRENCY = 8  # 定时任务中同时处理的用户/群聊数
+LARK_IO_WORKERS = 16  # 执行飞书发送请求的线程数
+PRERENDER_CARDS = 3  # 发送第一篇论文后预渲染的后续卡片数
+PAPER_CARD_TEMPLATE_ID = "AAqzQKpE1cGWO"
+GROUP_REFRESH_INTERVAL = timedelta(hours=1)  # 群聊列表的最短更新间隔
+
+# 消息开头的指令，群聊中指令前可能带有@提及(如"@_user_1 /daily_arxiv")
+_INSTRUCTION_RE = re.compile(r"\s*(?:@\S+\s+)*(/.*)", re.DOTALL)
+
+# 不变的消息内容只序列化一次
+EMPTY_DAILY_PAYLOAD = json.dumps({"text": "今日暂无满足要求的新文章"})
+
+_message_counter = itertools.count()
+
+
+def new_message_uuid() -> str:
+    """
+    发送消息时用于去重的uuid，只需保证每条消息唯一
+    由进程号、纳秒时间戳和自增计数组成，不必像uuid4那样每次读取系统随机数
+    """
+    return f"{os.getpid():x}-{time.time_ns():x}-{next(_message_counter):x}"
+
+
+# /config指令: 一次扫描找出required:/optional:标记，各自的内容到另一个标记或结尾为止
+_CONFIG_MARKER_RE = re.compile(r"(required|optional):")
+_CONFIG_COMMA_RE = re.compile(r"\s*,\s*")
+_CONFIG_OR_RE = re.compile(r" or ")
+
+
+def parse_config_args(config_str: str) -> tuple[list, list]:
+    """
+    解析/config的参数，返回(必需关键词, 可选关键词组)
+    例如"optional:A or B, C required:x,y"解析为(["x", "y"], [["A", "B"], ["C"]])
+    """
+    # 每种标记只取第一次出现的位置，后面重复的标记视为普通文本
+    markers = {}
+    for match in _CONFIG_MARKER_RE.finditer(config_str):
+        markers.setdefault(match.group(1), match)
+    ordered = sorted(markers.values(), key=lambda match: match.start())
+    sections = {
+        match.group(1): config_str[match.end() : ordered[i + 1].start() if i + 1 < len(ordered) else len(config_str)].strip()
+        for i, match in enumerate(ordered)
+    }
+
+    # required: 部分按逗号分隔
+    required_keywords = [kw for kw in _CONFIG_COMMA_RE.split(sections.get("required", "")) if kw]
+
+    # optional: 部分（二维数组语法）：A or B, C or D, E or F or G
+    # 先按逗号分组，每组内按 " or " 分割关键词，跳过空组
+    optional_keywords = [
+        keywords_in_group
+        for group in _CONFIG_COMMA_RE.split(sections.get("optional", ""))
+        if (keywords_in_group := [kw.strip() for kw in _CONFIG_OR_RE.split(group) if kw.strip()])
+    ]
+    return required_keywords, optional_keywords
+
+
+def paper_card_template(template_variable: dict) -> dict:
+    """论文卡片(飞书卡片模板)的结构，发送的JSON和卡片回调返回的字典共用"""
+    return {
+        "type": "template",
+        "data": {
+            "template_id": PAPER_CARD_TEMPLATE_ID,
+            "template_version_name": NEW_PAPER_CARD_VERSION,
+            "template_variable": template_variable,
+        },
+    }
+
+
+# 论文卡片的JSON骨架只序列化一次，发送时只需替换各个变量
+_PAPER_CARD_VARIABLES = ("title", "author", "date", "abstract", "translated_abstract", "link")
+_PAPER_CARD_JSON = string.Template(json.dumps(
+    paper_card_template({name: f"${name}" for name in _PAPER_CARD_VARIABLES})
+))
 
 class ArxivBot:
     def get_help_text(self):
@@ -31,6 +114,21 @@ class ArxivBot:
         self.client = lark.Client.builder().app_id(app_id).app_secret(app_secret).build()
         self.chat_manager = ChatManager()
         self.open_id_list = ['ou_a3e2ab794639d3cb462ec3846902457f']
+        self._last_group_refresh = None  # 上次成功更新群聊列表的时间
+        self._help_payload = json.dumps({"text": self.get_help_text()})
+        # 指令名 -> 处理函数(chat_id, 指令内容, 消息)
+        self._instruction_handlers = {
+            "/help": self.handle_help_command,
+            "/config": lambda chat_id, instruction_content, message: self.handle_config_command(chat_id, instruction_content),
+            "/daily_arxiv": self.handle_daily_arxiv_command,
+        }
+
+        # 所有异步任务共用一个常驻事件循环(在后台线程中运行)，不再每次请求都新建线程和事件循环
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="arxiv-bot-loop", daemon=True)
+        self._loop_thread.start()
+        # 飞书SDK的发送接口是阻塞的，在协程中统一交给这个线程池执行，避免阻塞事件循环
+        self._io_pool = ThreadPoolExecutor(max_workers=LARK_IO_WORKERS, thread_name_prefix="lark-io")
         
         # 注册事件处理器
         self.event_handler = (
@@ -48,10 +146,14 @@ class ArxivBot:
         )
     
     def find_instruction(self, content:str):
-        instr_pos = content.find('/')
-        if instr_pos == -1:
+        """
+        提取消息开头的指令(跳过群聊中开头的@提及)，不是指令时返回None
+        只检查消息开头，普通聊天消息在第一个非@的字符处即可返回
+        """
+        match = _INSTRUCTION_RE.match(content)
+        if match is None:
             return None
-        return content[instr_pos:].strip()
+        return match.group(1).strip()
 
     def do_p2_im_message_receive_v1(self, data: P2ImMessageReceiveV1) -> None:
         chat_id = data.event.message.chat_id
@@ -61,104 +163,110 @@ class ArxivBot:
             instruction_content = self.find_instruction(message_content)
             if instruction_content is None:
                 return
-            if instruction_content.startswith("/help"):
-                help_text = self.get_help_text()
-                self.send_text_message("chat_id", chat_id, json.dumps({"text": help_text}))
-                return
-            if instruction_content.startswith("/config"):
-                self.handle_config_command(chat_id, instruction_content)
-                return
-            elif instruction_content.startswith("/daily_arxiv"):
-                import asyncio
-                import threading
-                from datetime import datetime
-                date_from = None
-                date_until = None
-                parts = instruction_content.split()
-                if len(parts) > 1:
-                    date_args = parts[1].split(",")
-                    now_str = datetime.now().strftime("%Y-%m-%d")
-                    if len(date_args) >= 1:
-                        date_from = date_args[0]
-                    if len(date_args) >= 2:
-                        date_until = date_args[1]
-                        try:
-                            if date_until > now_str:
-                                date_until = now_str
-                        except:
-                            date_until = now_str
-                    else:
-                        date_until = now_str
-                def run_async_task():
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        loop.run_until_complete(self._handle_daily_arxiv(chat_id, data.event.message.chat_type, data.event.message.message_id, date_from, date_until))
-                    finally:
-                        loop.close()
-                thread = threading.Thread(target=run_async_task)
-                thread.start()
+            # 按指令名(第一个词)查表分发
+            handler = self._instruction_handlers.get(instruction_content.split(maxsplit=1)[0])
+            if handler is not None:
+                handler(chat_id, instruction_content, data.event.message)
         else:
             res_content = "解析消息失败，请发送文本消息"
             if data.event.message.chat_type == "p2p":
                 self.send_text_message("chat_id", chat_id, res_content)
 
+    def handle_help_command(self, chat_id: str, instruction_content: str, message):
+        """处理/help指令"""
+        self.send_text_message("chat_id", chat_id, self._help_payload)
+
+    def handle_daily_arxiv_command(self, chat_id: str, instruction_content: str, message):
+        """处理/daily_arxiv指令，在常驻事件循环中异步获取并发送论文"""
+        date_from = None
+        date_until = None
+        parts = instruction_content.split()
+        if len(parts) > 1:
+            date_args = parts[1].split(",")
+            now_str = date.today().isoformat()
+            if len(date_args) >= 1:
+                date_from = date_args[0]
+            if len(date_args) >= 2:
+                date_until = date_args[1]
+                try:
+                    if date_until > now_str:
+                        date_until = now_str
+                except:
+                    date_until = now_str
+            else:
+                date_until = now_str
+        self.run_async(self._handle_daily_arxiv(chat_id, message.chat_type, message.message_id, date_from, date_until))
+
     async def _handle_daily_arxiv(self, chat_id: str, chat_type: str, message_id: str, date_from=None, date_until=None):
         """异步处理每日论文请求，支持日期范围"""
         try:
-            from datetime import datetime
             if not date_from:
-                date_until = date_from = datetime.now().strftime("%Y-%m-%d")
+                date_until = date_from = date.today().isoformat()
             papers = await self.chat_manager.update_papers_for_chat(chat_id, date_from=date_from, date_until=date_until)
             if not papers:
                 # 计算时间范围
-                from datetime import datetime, timedelta
                 if date_from and date_until:
                     start_date = datetime.strptime(date_from, "%Y-%m-%d")
                     end_date = datetime.strptime(date_until, "%Y-%m-%d")
-                    time_range = f"{start_date.strftime('%Y-%m-%d')} - {end_date.strftime('%Y-%m-%d')}"
+                    time_range = f"{start_date.date().isoformat()} - {end_date.date().isoformat()}"
                 else:
                     end_date = datetime.now()
                     start_date = end_date - timedelta(days=PREV_DAY)
-                    time_range = f"{start_date.strftime('%Y-%m-%d')} - {end_date.strftime('%Y-%m-%d')}"
+                    time_range = f"{start_date.date().isoformat()} - {end_date.date().isoformat()}"
                 
                 null_msg = f"当前查询要求: {self.chat_manager.get_chat_config(chat_id)}\n{time_range}期间没有用户想要的论文"
                 null_msg = json.dumps({"text": null_msg})
-                self.send_text_message("chat_id", chat_id, null_msg)
+                await self._run_io(self.send_text_message, "chat_id", chat_id, null_msg)
             else:
                 # 生成卡片内容
                 card_content = self.create_paper_card(chat_id, papers)
-                self.send_card_message("chat_id", chat_id, card_content)
+                await self._run_io(self.send_card_message, "chat_id", chat_id, card_content)
+                self.prerender_cards(chat_id, 1)
         except Exception as e:
             error_text = f"获取论文失败: {str(e)}"
-            self.send_text_message("chat_id", chat_id, error_text)
+            await self._run_io(self.send_text_message, "chat_id", chat_id, error_text)
 
     def update_group_ids(self):
         """
-        更新机器人已经加入的群列表
+        更新机器人已经加入的群列表(按page_token翻页获取全部群聊)
+        距离上次成功更新不足GROUP_REFRESH_INTERVAL时直接跳过
         """
+        now = datetime.now()
+        if self._last_group_refresh and now - self._last_group_refresh < GROUP_REFRESH_INTERVAL:
+            print(f"群聊列表已于 {self._last_group_refresh.strftime('%H:%M:%S')} 更新，跳过本次更新")
+            return True
+
         try:
-            request: ListChatRequest = ListChatRequest.builder() \
-            .sort_type("ByCreateTimeAsc") \
-            .page_size(100) \
-            .build()
+            new_set = set()
+            page_token = None
+            while True:
+                builder = ListChatRequest.builder() \
+                    .sort_type("ByCreateTimeAsc") \
+                    .page_size(100)
+                if page_token:
+                    builder = builder.page_token(page_token)
+                request: ListChatRequest = builder.build()
 
-            # 发起请求 - 使用self.client而不是self.wsClient
-            response: ListChatResponse = self.client.im.v1.chat.list(request)
-            
-            if not response.success():
-                print(f"获取群聊列表失败: {response.code}, {response.msg}")
-                return False
+                # 发起请求 - 使用self.client而不是self.wsClient
+                response: ListChatResponse = self.client.im.v1.chat.list(request)
                 
-            chat_list = response.data.items if response.data else []
-            old_count = len(self.chat_manager.chat_id_set)
-            
-            for chat in chat_list:
-                if chat.chat_status == "normal":
-                    self.chat_manager.chat_id_set.add(chat.chat_id)
+                if not response.success():
+                    print(f"获取群聊列表失败: {response.code}, {response.msg}")
+                    return False
+                    
+                data = response.data
+                for chat in (data.items if data and data.items else []):
+                    if chat.chat_status == "normal":
+                        new_set.add(chat.chat_id)
+                
+                if not (data and data.has_more and data.page_token):
+                    break
+                page_token = data.page_token
             
-            new_count = len(self.chat_manager.chat_id_set)
-            print(f"群聊列表更新完成: 原有{old_count}个群聊，现有{new_count}个群聊")
+            old_count = len(self.chat_manager.chat_ids)
+            added, removed = self.chat_manager.replace_chat_ids(new_set)
+            self._last_group_refresh = now
+            print(f"群聊列表更新完成: 原有{old_count}个群聊，现有{len(new_set)}个群聊(新增{len(added)}个，移除{len(removed)}个)")
             return True
             
         except Exception as e:
@@ -167,7 +275,7 @@ class ArxivBot:
     
     def get_group_ids(self):
         """获取已加入的群聊ID列表"""
-        return list(self.chat_manager.chat_id_set)
+        return list(self.chat_manager.chat_ids)
 
     def handle_config_command(self, chat_id: str, command: str):
         """
@@ -179,49 +287,7 @@ class ArxivBot:
             if len(parts) < 2:
                 return
                 
-            config_str = parts[1]
-            required_keywords = []
-            optional_keywords = []
-            
-            # 分别查找 required: 和 optional: 的位置
-            required_pos = config_str.find('required:')
-            optional_pos = config_str.find('optional:')
-            
-            # 处理 required: 部分（保持原有逻辑）
-            if required_pos != -1:
-                start = required_pos + len('required:')
-                if optional_pos != -1 and optional_pos > required_pos:
-                    end = optional_pos
-                else:
-                    end = len(config_str)
-                
-                required_str = config_str[start:end].strip()
-                if required_str:
-                    required_keywords = [kw.strip() for kw in required_str.split(',') if kw.strip()]
-                else:
-                    required_keywords = []
-            
-            # 处理 optional: 部分（新的二维数组语法）
-            if optional_pos != -1:
-                start = optional_pos + len('optional:')
-                if required_pos != -1 and required_pos > optional_pos:
-                    end = required_pos
-                else:
-                    end = len(config_str)
-                
-                optional_str = config_str[start:end].strip()
-                if optional_str:
-                    # 解析新语法：A or B, C or D, E or F or G
-                    # 先按逗号分组
-                    groups = [group.strip() for group in optional_str.split(',') if group.strip()]
-                    optional_keywords = []
-                    for group in groups:
-                        # 每组内按 "or" 分割关键词
-                        keywords_in_group = [kw.strip() for kw in group.split(' or ') if kw.strip()]
-                        if keywords_in_group:
-                            optional_keywords.append(keywords_in_group)
-                else:
-                    optional_keywords = []
+            required_keywords, optional_keywords = parse_config_args(parts[1])
             
             # 更新配置
             new_config = ChatConfig(
@@ -256,50 +322,60 @@ class ArxivBot:
                 return P2CardActionTriggerResponse(content)
             
             chat_papers = self.chat_manager.get_chat_papers(chat_id)
+            # 切换的同时论文列表被整体替换时，index可能已不对应这篇论文，此时直接渲染
+            if index < len(chat_papers.papers) and chat_papers.papers[index] is paper:
+                card = self.get_rendered_card(chat_papers, index)
+            else:
+                card = self.render_paper_card(paper)
             content = {
                 "toast": {
                     "type": "info",
                     "content": f"已切换到下一篇文章 (第{index+1}篇), 共{len(chat_papers.papers)}篇",
                 },
-                "card": {
-                    "type": "template",
-                    "data": {
-                        "template_id": "AAqzQKpE1cGWO",
-                        "template_version_name": NEW_PAPER_CARD_VERSION,
-                        "template_variable": {
-                            "title": paper.title,
-                            "author": paper.authors,
-                            "date": paper.first_announced_date.strftime("%Y-%m-%d"),
-                            "abstract": paper.abstract,
-                            "translated_abstract": paper.abstract_translated if paper.abstract_translated else "暂无",
-                            "link": paper.url.strip()
-                        },
-                    },
-                },
+                "card": card,
             }
+            # 用户阅读当前论文时，在常驻事件循环中提前渲染下一篇，不占用本次回调的响应时间
+            self._loop.call_soon_threadsafe(self.prerender_cards, chat_id, index + 1, 1)
             return P2CardActionTriggerResponse(content)
 
+    def get_rendered_card(self, chat_papers: ChatPapers, index: int) -> dict:
+        """获取第index篇论文的卡片，已预渲染时直接返回"""
+        rendered = chat_papers.rendered
+        if rendered[index] is None:
+            rendered[index] = self.render_paper_card(chat_papers.papers[index])
+        return rendered[index]
+
+    def prerender_cards(self, chat_id: str, start: int, count: int = PRERENDER_CARDS):
+        """预渲染从start开始的count篇论文的卡片(到结尾后回到第一篇，与"下一篇"的顺序一致)"""
+        chat_papers = self.chat_manager.get_chat_papers(chat_id)
+        papers = chat_papers.papers
+        for i in range(start, start + min(count, len(papers))):
+            self.get_rendered_card(chat_papers, i % len(papers))
+
+    def render_paper_card(self, paper) -> dict:
+        """卡片回调中返回的论文卡片"""
+        return paper_card_template(self.paper_card_variables(paper))
+
     def create_paper_card(self, chat_id: str, papers: list) -> str:
         """创建论文卡片"""
         if not papers:
             return ""
             
-        paper = papers[0]
-        return json.dumps({
-            "type": "template",
-            "data": {
-                "template_id": "AAqzQKpE1cGWO",
-                "template_version_name": NEW_PAPER_CARD_VERSION,
-                "template_variable": {
-                    "title": paper.title,
-                    "author": paper.authors,
-                    "date": paper.first_announced_date.strftime("%Y-%m-%d"),
-                    "abstract": paper.abstract,
-                    "translated_abstract": paper.abstract_translated if paper.abstract_translated else "暂无",
-                    "link": paper.url.strip()
-                }
-            }
-        })
+        # 每个变量单独转义为JSON字符串(去掉两端引号)后填入预先序列化好的骨架
+        variables = self.paper_card_variables(papers[0])
+        return _PAPER_CARD_JSON.substitute({name: json.dumps(value)[1:-1] for name, value in variables.items()})
+
+    @staticmethod
+    def paper_card_variables(paper) -> dict:
+        """论文卡片模板中的变量"""
+        return {
+            "title": paper.title,
+            "author": paper.authors,
+            "date": paper.first_announced_date.date().isoformat(),
+            "abstract": paper.abstract,
+            "translated_abstract": paper.abstract_translated if paper.abstract_translated else "暂无",
+            "link": paper.url.strip()
+        }
 
     def send_card_message(self, id_type:str, chat_id: str, card_content: str):
         """发送卡片消息"""
@@ -311,7 +387,7 @@ class ArxivBot:
                 .receive_id(chat_id)
                 .msg_type("interactive")
                 .content(card_content)
-                .uuid(str(uuid.uuid4()))
+                .uuid(new_message_uuid())
                 .build()
             )
             .build()
@@ -331,7 +407,7 @@ class ArxivBot:
                 .receive_id(chat_id)
                 .msg_type("text")
                 .content(text_content)
-                .uuid(str(uuid.uuid4()))
+                .uuid(new_message_uuid())
                 .build()
             )
             .build()
@@ -359,32 +435,32 @@ class ArxivBot:
         if not response.success():
             raise Exception(f"回复消息失败: {response.code}, {response.msg}")
 
-    def send_daily_papers(self):
-        """定时发送每日论文"""
-        import asyncio
-        import threading
-        from datetime import datetime
-        
+    def run_async(self, coro):
+        """将协程提交到常驻事件循环中执行，立即返回concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _run_io(self, func, *args):
+        """在线程池中执行阻塞的飞书请求并等待结果"""
+        return await asyncio.get_running_loop().run_in_executor(self._io_pool, func, *args)
+
+    def call_in_loop(self, func, *args):
+        """在常驻事件循环中执行普通函数并等待其返回(用于必须在事件循环线程中调用的接口)"""
+        async def call():
+            return func(*args)
+        return self.run_async(call()).result()
+
+    async def run_daily_papers(self):
+        """定时发送每日论文，由AsyncIOScheduler直接在常驻事件循环中调度"""
         # 记录任务开始时间
         start_time = datetime.now()
         print(f"[{start_time.strftime('%Y-%m-%d %H:%M:%S.%f')}] 定时任务开始执行")
-        
-        def run_async_task():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(self._send_daily_papers_async())
-                end_time = datetime.now()
-                duration = end_time - start_time
-                print(f"[{end_time.strftime('%Y-%m-%d %H:%M:%S.%f')}] 定时任务执行完成，耗时: {duration}")
-            except Exception as e:
-                print(f"定时任务执行失败: {e}")
-            finally:
-                loop.close()
-        
-        # 在新线程中运行异步任务
-        thread = threading.Thread(target=run_async_task)
-        thread.start()
+        try:
+            await self._send_daily_papers_async()
+            end_time = datetime.now()
+            duration = end_time - start_time
+            print(f"[{end_time.strftime('%Y-%m-%d %H:%M:%S.%f')}] 定时任务执行完成，耗时: {duration}")
+        except Exception as e:
+            print(f"定时任务执行失败: {e}")
     
     async def _send_daily_papers_async(self):
         """异步发送每日论文"""
@@ -393,73 +469,106 @@ class ArxivBot:
         # 先更新群聊列表
         try:
             print("开始更新群聊列表...")
-            update_success = self.update_group_ids()
+            update_success = await self._run_io(self.update_group_ids)
             if update_success:
-                print(f"群聊列表更新成功，当前有 {len(self.chat_manager.chat_id_set)} 个群聊")
+                print(f"群聊列表更新成功，当前有 {len(self.chat_manager.chat_ids)} 个群聊")
             else:
                 print("群聊列表更新失败，但继续执行任务")
         except Exception as e:
             print(f"更新群聊列表失败: {e}")
             # 不return，继续执行其他任务
         
-        # 向所有用户发送每日论文
-        print(f"开始向 {len(self.open_id_list)} 个用户发送每日论文...")
-        for i, open_id in enumerate(self.open_id_list, 1):
+        # 向所有用户和群聊并发发送每日论文，信号量限制同时处理的会话数，避免触发arXiv/飞书的限流
+        sem = asyncio.Semaphore(DAILY_SEND_CONCURRENCY)
+        user_count = len(self.open_id_list)
+        print(f"开始向 {user_count} 个用户发送每日论文...")
+        # 先取群聊列表的快照，发送期间列表被更新也不影响本次遍历
+        chat_ids = self.chat_manager.chat_ids
+        group_count = len(chat_ids)
+        print(f"开始向 {group_count} 个群聊发送每日论文...")
+        await asyncio.gather(
+            self._send_daily_to_users(list(self.open_id_list), sem),
+            *[self._send_daily_to_chat(i, group_count, chat_id, sem) for i, chat_id in enumerate(chat_ids, 1)],
+        )
+        
+        print(f"每日论文发送任务完成！")
+
+    async def _send_daily_to_users(self, open_ids: list, sem: asyncio.Semaphore):
+        """
+        向所有用户发送每日论文。用户都使用默认配置，收到的卡片相同，
+        多个用户时先尝试通过批量发送接口一次发出，失败或没有论文时再逐个发送
+        """
+        if len(open_ids) > 1:
             try:
-                print(f"处理用户 {i}/{len(self.open_id_list)}: {open_id[:8]}...")
+                async with sem:
+                    papers = await self.chat_manager.update_papers_for_chat("default")
+                    if papers:
+                        await self._run_io(self.send_card_to_users, open_ids, self.render_paper_card(papers[0]))
+                        self.prerender_cards("default", 1)
+                        print(f"成功批量发送 {len(papers)} 篇论文给 {len(open_ids)} 个用户")
+                        return
+            except Exception as e:
+                print(f"批量发送每日论文给用户失败，改为逐个发送: {e}")
+        
+        # 逐个发送(抓取结果有缓存，不会重复抓取)
+        await asyncio.gather(
+            *[self._send_daily_to_user(i, len(open_ids), open_id, sem) for i, open_id in enumerate(open_ids, 1)]
+        )
+
+    async def _send_daily_to_user(self, i: int, total: int, open_id: str, sem: asyncio.Semaphore):
+        """向单个用户发送每日论文，飞书SDK的阻塞请求放到线程中执行"""
+        async with sem:
+            try:
+                print(f"处理用户 {i}/{total}: {open_id[:8]}...")
                 # 为每个用户使用默认配置
                 papers = await self.chat_manager.update_papers_for_chat("default")
                 
                 if papers:
                     card_content = self.create_paper_card("default", papers)
-                    self.send_card_to_user(open_id, card_content)
+                    await self._run_io(self.send_card_to_user, open_id, card_content)
+                    self.prerender_cards("default", 1)
                     print(f"成功发送 {len(papers)} 篇论文给用户")
                 else:
-                    text_content = json.dumps({"text": "今日暂无满足要求的新文章"})
-                    self.send_text_to_user(open_id, text_content)
+                    await self._run_io(self.send_text_to_user, open_id, EMPTY_DAILY_PAYLOAD)
                     print(f"发送空结果消息给用户")
             except Exception as e:
                 print(f"发送每日论文给用户 {open_id[:8]} 失败: {e}")
                 try:
                     text_content = json.dumps({"text": f"获取每日论文失败: {str(e)}"})
-                    self.send_text_to_user(open_id, text_content)
+                    await self._run_io(self.send_text_to_user, open_id, text_content)
                 except Exception as inner_e:
                     print(f"发送错误消息给用户也失败了: {inner_e}")
-        
-        # 向所有群聊发送每日论文
-        group_count = len(self.chat_manager.chat_id_set)
-        print(f"开始向 {group_count} 个群聊发送每日论文...")
-        
-        for i, chat_id in enumerate(self.chat_manager.chat_id_set, 1):
+
+    async def _send_daily_to_chat(self, i: int, total: int, chat_id: str, sem: asyncio.Semaphore):
+        """向单个群聊发送每日论文，飞书SDK的阻塞请求放到线程中执行"""
+        async with sem:
             try:
-                print(f"处理群聊 {i}/{group_count}: {chat_id[:8]}...")
+                print(f"处理群聊 {i}/{total}: {chat_id[:8]}...")
                 # 为每个群聊获取对应的配置
                 papers = await self.chat_manager.update_papers_for_chat(chat_id)
                 
                 if papers:
                     card_content = self.create_paper_card(chat_id, papers)
-                    self.send_card_message("chat_id", chat_id, card_content)
+                    await self._run_io(self.send_card_message, "chat_id", chat_id, card_content)
+                    self.prerender_cards(chat_id, 1)
                     print(f"成功发送 {len(papers)} 篇论文到群聊: {chat_id[:8]}")
                 else:
                     config = self.chat_manager.get_chat_config(chat_id)
                     # 计算时间范围
-                    from datetime import datetime, timedelta
                     end_date = datetime.now()
                     start_date = end_date - timedelta(days=PREV_DAY)
-                    time_range = f"{start_date.strftime('%Y-%m-%d')} - {end_date.strftime('%Y-%m-%d')}"
+                    time_range = f"{start_date.date().isoformat()} - {end_date.date().isoformat()}"
                     
                     null_msg = f"当前查询要求: 必需关键词{config.required_keywords}, 可选关键词组{config.optional_keywords}\n{time_range}期间没有用户想要的论文"
-                    self.send_text_message("chat_id", chat_id, json.dumps({"text": null_msg}))
+                    await self._run_io(self.send_text_message, "chat_id", chat_id, json.dumps({"text": null_msg}))
                     print(f"发送空结果消息到群聊: {chat_id[:8]}")
             except Exception as e:
                 print(f"发送每日论文到群聊 {chat_id[:8]} 失败: {e}")
                 try:
                     error_text = f"获取每日论文失败: {str(e)}"
-                    self.send_text_message("chat_id", chat_id, json.dumps({"text": error_text}))
+                    await self._run_io(self.send_text_message, "chat_id", chat_id, json.dumps({"text": error_text}))
                 except Exception as inner_e:
                     print(f"发送错误消息到群聊 {chat_id[:8]} 也失败了: {inner_e}")
-        
-        print(f"每日论文发送任务完成！")
 
     def send_card_to_user(self, open_id: str, card_content: str):
         """发送卡片给用户"""
@@ -471,7 +580,7 @@ class ArxivBot:
                 .receive_id(open_id)
                 .msg_type("interactive")
                 .content(card_content)
-                .uuid(str(uuid.uuid4()))
+                .uuid(new_message_uuid())
                 .build()
             )
             .build()
@@ -481,6 +590,24 @@ class ArxivBot:
         if not response.success():
             raise Exception(f"发送用户卡片失败: {response.code}, {response.msg}")
 
+    def send_card_to_users(self, open_ids: list, card: dict):
+        """
+        通过批量发送接口将同一张卡片发给多个用户
+        SDK没有封装该接口，使用通用请求调用；批量发送只支持用户，不支持群聊
+        """
+        request = (
+            lark.BaseRequest.builder()
+            .http_method(lark.HttpMethod.POST)
+            .uri("/open-apis/message/v4/batch_send/")
+            .token_types({lark.AccessTokenType.TENANT})
+            .body({"open_ids": open_ids, "msg_type": "interactive", "card": card})
+            .build()
+        )
+        
+        response = self.client.request(request)
+        if not response.success():
+            raise Exception(f"批量发送用户卡片失败: {response.code}, {response.msg}")
+
     def send_text_to_user(self, open_id: str, text_content: str):
         """发送文本给用户"""
         request = (
@@ -491,7 +618,7 @@ class ArxivBot:
                 .receive_id(open_id)
                 .msg_type("text")
                 .content(text_content)
-                .uuid(str(uuid.uuid4()))
+                .uuid(new_message_uuid())
                 .build()
             )
             .build()
@@ -505,27 +632,64 @@ class ArxivBot:
         """启动机器人"""
         self.wsClient.start()
 
-import os
 from dotenv import load_dotenv
 load_dotenv()
 # 读取环境变量
 APP_ID = os.environ.get("APP_ID")
 APP_SECRET = os.environ.get("APP_SECRET")
+PROJECT_DIR = Path(__file__).resolve().parent
+SCHEDULER_DB_URL = f"sqlite:///{PROJECT_DIR / 'scheduler.db'}"  # 定时任务的持久化存储，重启后仍能补发错过的任务
+DAILY_JOB_ID = "send_daily_papers"
+
+_bot = None  # main()中创建的机器人实例，供定时任务使用
+
+
+async def send_daily_papers_job():
+    """定时任务入口。持久化的任务只能引用模块级函数，不能直接引用机器人实例的方法"""
+    await _bot.run_daily_papers()
+
+
+def create_jobstores():
+    """优先使用sqlite持久化任务(需要安装SQLAlchemy)，否则退回内存存储"""
+    try:
+        from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+    except ImportError:
+        print("未安装SQLAlchemy，定时任务不会持久化，进程重启期间错过的任务不会补发")
+        return {}
+    return {'default': SQLAlchemyJobStore(url=SCHEDULER_DB_URL)}
+
+
 def main():
-    bot = ArxivBot(APP_ID, APP_SECRET)
+    global _bot
+    bot = _bot = ArxivBot(APP_ID, APP_SECRET)
 
     # 设置定时任务，添加更宽松的错过策略
-    scheduler = BackgroundScheduler(
+    # 调度器运行在机器人的常驻事件循环中，定时任务是协程，不再额外创建线程
+    scheduler = AsyncIOScheduler(
+        event_loop=bot._loop,
+        jobstores=create_jobstores(),
         timezone='Asia/Shanghai', 
-        daemon=True,
         job_defaults={
-            'coalesce': False,  # 不合并错过的任务
+            'coalesce': True,  # 错过的多次任务合并为一次执行
             'max_instances': 1,  # 最多只允许一个实例运行
-            'misfire_grace_time': 100  # 允许100秒的延迟容忍度
+            'misfire_grace_time': 3600  # 启动较晚或重启后，1小时内错过的任务仍会执行
         }
     )
-    job = scheduler.add_job(bot.send_daily_papers, 'cron', hour=20, minute=30)
-    scheduler.start()
+    # 先以暂停状态启动以加载持久化的任务，再用代码中的定义替换它，修改执行时间后重启即可生效
+    # 替换会按新的触发器从现在起重新计算下次执行时间，因此重启期间错过的执行时间要先记下，替换后再恢复
+    bot.call_in_loop(scheduler.start, True)
+    stored = scheduler.get_job(DAILY_JOB_ID)
+    missed_run_time = None
+    if stored is not None and stored.next_run_time is not None:
+        if stored.next_run_time < datetime.now(stored.next_run_time.tzinfo):
+            missed_run_time = stored.next_run_time
+    job = scheduler.add_job(
+        send_daily_papers_job, 'cron', hour=20, minute=30, id=DAILY_JOB_ID, replace_existing=True
+    )
+    if missed_run_time is not None:
+        # 恢复后由misfire_grace_time决定是否补发，补发后按新的触发器计算下次执行时间
+        job = scheduler.modify_job(DAILY_JOB_ID, next_run_time=missed_run_time)
+    bot.call_in_loop(scheduler.resume)
     print(f"定时任务已添加: {job}")
     print(f"调度器状态: {scheduler.state}")
     print(f"所有任务: {scheduler.get_jobs()}")
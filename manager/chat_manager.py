@@ -1,8 +1,31 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional
-from datetime import datetime
+import asyncio
+import random
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 import json
+import os
+from pathlib import Path
 from arxiv_crawler.arxiv_crawler import get_daily_llm_papers
+from arxiv_crawler.paper import PaperDatabase
+
+# orjson是可选依赖，序列化更快；未安装时使用标准库json
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+    _loads = json.loads
+
+PAPER_CACHE_TTL = timedelta(minutes=30)  # 相同查询条件的抓取结果的复用时长
+CHAT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "chat_configs.json"  # 群聊配置的保存路径(项目根目录)
 
 @dataclass
 class ChatConfig:
@@ -11,8 +34,24 @@ class ChatConfig:
     translate: bool = True
     
     # 使用新的关键词系统
-    required_keywords: List[str] = None
-    optional_keywords: List[str] = None
+    required_keywords: Tuple[str, ...] = None
+    optional_keywords: Tuple[Tuple[str, ...], ...] = None
+    # 关键词的规范形式(不区分大小写和顺序)，用作抓取结果缓存的键，构造时计算一次
+    keyword_key: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # 关键词统一存为不可变的元组；必需关键词为None等价于没有必需关键词
+        # 可选关键词为None时表示使用抓取器的默认关键词，因此保留None
+        self.required_keywords = tuple(self.required_keywords or ())
+        if self.optional_keywords is not None:
+            self.optional_keywords = tuple(tuple(group) for group in self.optional_keywords)
+        # 必需关键词之间AND、可选关键词组内OR组间AND，顺序都不影响结果；搜索本身不区分大小写
+        # 可选关键词为None(默认关键词)与为空(不过滤)的抓取结果不同，键中保留None以区分
+        self.keyword_key = (
+            frozenset(kw.lower() for kw in self.required_keywords or ()),
+            None if self.optional_keywords is None
+            else frozenset(frozenset(kw.lower() for kw in group) for group in self.optional_keywords),
+        )
 
 @dataclass
 class ChatPapers:
@@ -20,19 +59,34 @@ class ChatPapers:
     papers: List = None
     last_update: datetime = None
     current_index: int = 0
+    # 与papers一一对应的预渲染卡片，未渲染的位置为None
+    rendered: List = None
     
     def __post_init__(self):
         if self.papers is None:
             self.papers = []
+        if self.rendered is None:
+            self.rendered = [None] * len(self.papers)
 
 class ChatManager:
     """群聊管理器"""
     
-    def __init__(self):
+    def __init__(self, config_path=CHAT_CONFIG_PATH):
+        self.config_path = Path(config_path)
+        self._save_lock = threading.Lock()
         self.chat_config: Dict[str, ChatConfig] = {}
         self.chat_papers: Dict[str, ChatPapers] = {}
+        # 抓取结果缓存: (查询条件) -> (抓取时间, 论文列表)，配置相同的群聊共用一次抓取
+        self._paper_cache: Dict[tuple, tuple] = {}
+        # 每个查询条件一把锁及其使用者数，同一条件的并发请求只会触发一次抓取；没有使用者时删除
+        self._paper_locks: Dict[tuple, list] = {}
         self.load_chat_configs()
-        self.chat_id_set = set()
+        # 机器人所在的群聊: 集合用于比较增减，元组是只在列表更新时重建的快照，供遍历使用
+        self._chat_id_set = set()
+        self._chat_ids: tuple = ()
+        self._chat_id_lock = threading.Lock()
+        # 搜索用的数据库连接，sqlite连接不能跨线程使用，因此每个线程各自复用一个
+        self._local = threading.local()
         
     def load_chat_configs(self):
         """加载群聊配置（可以从文件或数据库加载）"""
@@ -47,10 +101,47 @@ class ChatManager:
             ),
         }
         
+        
+        # 已保存的配置覆盖默认配置
+        if self.config_path.exists():
+            try:
+                saved = _loads(self.config_path.read_bytes())
+            except ValueError as e:
+                print(f"读取群聊配置 {self.config_path} 失败，使用默认配置: {e}")
+                saved = {}
+            # 逐条加载，个别配置格式错误时只跳过这一条，其余群聊的配置仍然保留(下次保存时也不会丢失)
+            for config_id, data in saved.items():
+                try:
+                    default_configs[config_id] = ChatConfig(**data)
+                except (ValueError, TypeError) as e:
+                    print(f"跳过格式错误的群聊配置 {config_id}: {e}")
+        
         for config_id, config in default_configs.items():
             self.chat_config[config_id] = config
             self.chat_papers[config_id] = ChatPapers()
     
+    @property
+    def db(self) -> PaperDatabase:
+        """当前线程复用的数据库连接"""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = PaperDatabase()
+        return db
+
+    @property
+    def chat_ids(self) -> tuple:
+        """当前群聊ID的快照，遍历期间群聊列表被更新也不受影响"""
+        return self._chat_ids
+
+    def replace_chat_ids(self, chat_ids) -> tuple[set, set]:
+        """用新的群聊ID列表替换现有列表，返回(新增的ID, 移除的ID)"""
+        new_set = set(chat_ids)
+        with self._chat_id_lock:
+            added, removed = new_set - self._chat_id_set, self._chat_id_set - new_set
+            self._chat_id_set = new_set
+            self._chat_ids = tuple(new_set)
+        return added, removed
+
     def get_chat_config(self, chat_id: str) -> ChatConfig:
         """获取群聊配置，如果不存在则使用默认配置"""
         return self.chat_config.get(chat_id, self.chat_config.get("default"))
@@ -65,19 +156,48 @@ class ChatManager:
         """更新指定群聊的论文数据，支持区间查询"""
         config = self.get_chat_config(chat_id)
         print(f'\nconfig如下: {config}\n')
-        papers = await get_daily_llm_papers(
-            date_from=date_from,
-            date_until=date_until,
-            translate=config.translate,
-            required_keywords=config.required_keywords,
-            optional_keywords=config.optional_keywords
-        )
-        chat_papers = self.get_chat_papers(chat_id)
-        chat_papers.papers = papers
-        chat_papers.last_update = datetime.now()
-        chat_papers.current_index = 0
+        papers = await self._fetch_papers_cached(config, date_from, date_until)
+        # 整体替换而不是逐个修改字段，卡片回调线程不会看到新论文列表与旧渲染结果混在一起
+        self.chat_papers[chat_id] = ChatPapers(papers=papers, last_update=datetime.now())
         return papers
     
+    async def _fetch_papers_cached(self, config: ChatConfig, date_from: str = None, date_until: str = None) -> List:
+        """按(日期区间, 关键词, 是否翻译)缓存抓取结果，过期时间为PAPER_CACHE_TTL"""
+        # 未指定的日期在get_daily_llm_papers中按今天处理，缓存键也按同样的方式补全
+        today = date.today().isoformat()
+        key = (date_from or today, date_until or today, config.keyword_key, config.translate)
+        entry = self._paper_locks.get(key)
+        if entry is None:
+            entry = self._paper_locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                cached = self._paper_cache.get(key)
+                if cached and datetime.now() - cached[0] < PAPER_CACHE_TTL:
+                    print(f"复用 {cached[0].strftime('%H:%M:%S')} 抓取的 {len(cached[1])} 篇论文")
+                    return cached[1]
+                papers = await get_daily_llm_papers(
+                    date_from=date_from,
+                    date_until=date_until,
+                    translate=config.translate,
+                    required_keywords=config.required_keywords,
+                    optional_keywords=config.optional_keywords
+                )
+                self._prune_paper_cache()
+                self._paper_cache[key] = (datetime.now(), papers)
+                return papers
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._paper_locks[key]
+
+    def _prune_paper_cache(self):
+        """删除已过期的抓取结果，常驻进程中缓存不会随日期和关键词组合的增加而一直增长"""
+        now = datetime.now()
+        for key, (fetched_at, _) in list(self._paper_cache.items()):
+            if now - fetched_at >= PAPER_CACHE_TTL:
+                del self._paper_cache[key]
+
     def get_current_paper(self, chat_id: str, index: int = 0):
         """获取当前显示的论文"""
         chat_papers = self.get_chat_papers(chat_id)
@@ -102,7 +222,6 @@ class ChatManager:
     
     def get_random_paper(self, chat_id: str):
         """获取随机论文"""
-        import random
         chat_papers = self.get_chat_papers(chat_id)
         
         if not chat_papers.papers:
@@ -115,12 +234,9 @@ class ChatManager:
     def search_papers_by_keywords(self, chat_id: str, required_keywords: list[str] = None, 
                                   optional_keywords: list[str] = None, limit: int = 10) -> list:
         """根据关键词搜索论文"""
-        from arxiv_crawler.paper import PaperDatabase
-        
         config = self.get_chat_config(chat_id)
-        db = PaperDatabase()
         
-        papers = db.search_papers_by_keywords(
+        papers = self.db.search_papers_by_keywords(
             required_keywords=required_keywords or [],
             optional_keywords=optional_keywords or config.optional_keywords,
             limit=limit
@@ -130,11 +246,7 @@ class ChatManager:
     
     def search_papers_by_text(self, chat_id: str, search_text: str, limit: int = 10) -> list:
         """根据文本搜索论文"""
-        from arxiv_crawler.paper import PaperDatabase
-        
-        db = PaperDatabase()
-        
-        papers = db.search_papers_by_text(
+        papers = self.db.search_papers_by_text(
             search_text=search_text,
             limit=limit
         )
@@ -146,8 +258,27 @@ class ChatManager:
         self.chat_config[chat_id] = config
         if chat_id not in self.chat_papers:
             self.chat_papers[chat_id] = ChatPapers()
+        # 在事件循环中调用时放到线程池里写文件，避免阻塞事件循环
+        try:
+            future = asyncio.get_running_loop().run_in_executor(None, self.save_chat_configs)
+        except RuntimeError:
+            self.save_chat_configs()
+        else:
+            future.add_done_callback(self._log_save_error)
+
+    @staticmethod
+    def _log_save_error(future: asyncio.Future):
+        """后台保存群聊配置失败时输出错误，避免异常被静默丢弃"""
+        if not future.cancelled() and future.exception() is not None:
+            print(f"保存群聊配置失败: {future.exception()}")
     
     def save_chat_configs(self):
-        """保存群聊配置到文件"""
-        # 可以实现保存到JSON文件或数据库
-        pass
\ No newline at end of file
+        """保存群聊配置到文件(先写临时文件再替换，写入中途崩溃也不会损坏原文件)"""
+        data = _dumps({
+            config_id: {f.name: getattr(config, f.name) for f in fields(config) if f.init}
+            for config_id, config in list(self.chat_config.items())
+        })
+        tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
+        with self._save_lock:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self.config_path)
\ No newline at end of file
@@ -0,0 +1,146 @@
+import sys
+import xml.etree.ElementTree
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import arxiv_crawler.arxiv_crawler as crawler
+from arxiv_crawler.arxiv_crawler import ArxivScraper, parse_api_date, parse_search_date
+from manager.chat_manager import ChatConfig
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+API_PAPERS = [
+    (
+        "http://arxiv.org/abs/2501.00002v1",
+        "WebAgent: A Browsing Agent for Deep Research",
+        datetime(2025, 1, 2),
+        ("cs.CL", "cs.AI"),
+        "Alice Zhang, Bob Li",
+        "We present WebAgent, an LLM-based agent that browses the web to answer research questions.",
+        "12 pages, 3 figures",
+    ),
+    (
+        "http://arxiv.org/abs/2412.99999v2",
+        "Research Agents in the Wild",
+        datetime(2024, 12, 31),
+        ("cs.AI",),
+        "Carol Wang",
+        "A survey of research agents.",
+        "No comments",
+    ),
+]
+
+SEARCH_PAPERS = [
+    (
+        "https://arxiv.org/abs/2408.04567",
+        "Large Language Model Agents for Deep Web Research",
+        datetime(2024, 8, 8),
+        ("cs.CL", "cs.AI"),
+        "Alice Zhang,Bob Li",
+        "We study LLM agents that browse the web for research.",
+        "No comments",
+    ),
+    (
+        "https://arxiv.org/abs/physics/9403001",
+        "Desperately Seeking Superstrings",
+        datetime(1986, 4, 25),
+        ("physics.pop-ph", "hep-th"),
+        "Paul Ginsparg,Sheldon Glashow",
+        "We provide a detailed analysis of the problems and prospects of superstring theory c. 1986, "
+        "anticipating much of the progress of the decades to follow.",
+        "originally appeared as a Reference Frame in Physics\n                    Today, May 1986",
+    ),
+]
+
+
+def paper_fields(paper):
+    return (
+        paper.url,
+        paper.title,
+        paper.first_submitted_date,
+        tuple(paper.categories),
+        paper.authors,
+        paper.abstract,
+        paper.comments,
+    )
+
+
+def make_scraper(**kwargs):
+    return ArxivScraper("2025-01-02", "2025-01-02", db_path=":memory:", **kwargs)
+
+
+@pytest.fixture(params=["lxml", "stdlib"])
+def parser_backend(request, monkeypatch):
+    """分别使用lxml和未安装lxml时的标准库解析"""
+    if request.param == "stdlib":
+        monkeypatch.setattr(crawler, "ET", xml.etree.ElementTree)
+        monkeypatch.setattr(crawler, "HAS_LXML", False)
+        monkeypatch.setattr(crawler, "HTML_PARSER", "html.parser")
+        monkeypatch.setattr(crawler, "_parse_iso", None)
+    return request.param
+
+
+def test_parse_api_xml(parser_backend):
+    papers, total, earliest_date = make_scraper().parse_api_xml((FIXTURES / "arxiv_api.xml").read_bytes())
+    assert [paper_fields(paper) for paper in papers] == API_PAPERS
+    assert [paper.first_announced_date for paper in papers] == [datetime(2025, 1, 2), datetime(2024, 12, 31)]
+    assert total == 123
+    assert earliest_date == datetime(2024, 12, 31)
+
+
+def test_parse_api_xml_invalid():
+    scraper = make_scraper()
+    assert scraper.parse_api_xml(None) == ([], None, None)
+    assert scraper.parse_api_xml(b"<feed><entry>") == ([], None, None)
+
+
+def test_parse_search_html(parser_backend):
+    content = (FIXTURES / "arxiv_search.html").read_bytes()
+    scraper = make_scraper()
+    assert [paper_fields(paper) for paper in scraper.parse_search_html(content)] == SEARCH_PAPERS
+    assert scraper.total == 2
+    assert [paper_fields(paper) for paper in ArxivScraper.parse_search_page(content)] == SEARCH_PAPERS
+
+
+def test_parse_dates(monkeypatch):
+    assert parse_api_date("2024-08-26T17:59:59Z") == datetime(2024, 8, 26)
+    monkeypatch.setattr(crawler, "_parse_iso", None)
+    assert parse_api_date("2024-08-26T17:59:59Z") == datetime(2024, 8, 26)
+    assert parse_search_date("8 August, 2024") == datetime(2024, 8, 8)
+    assert parse_search_date("25 April, 1986") == datetime(1986, 4, 25)
+    with pytest.raises(ValueError):
+        parse_search_date("8 Augustus, 2024")
+
+
+def test_api_url_keeps_optional_keyword_groups():
+    """ChatConfig中的关键词组是元组，构建查询时不能被丢弃"""
+    config = ChatConfig("default", required_keywords=["agent"], optional_keywords=[["research", "browse"]])
+    scraper = make_scraper(required_keywords=config.required_keywords, optional_keywords=config.optional_keywords)
+    assert scraper.get_api_url(start=50, max_results=50) == (
+        "http://export.arxiv.org/api/query?search_query="
+        "((ti:research+OR+abs:research)+OR+(ti:browse+OR+abs:browse))+AND+(ti:agent+OR+abs:agent)"
+        "&start=50&max_results=50&sortBy=submittedDate&sortOrder=descending"
+    )
+
+
+def test_search_and_api_urls():
+    scraper = make_scraper(optional_keywords=[["research", "browse"]], required_keywords=["agent", "language model"])
+    assert scraper.get_url(50) == (
+        "https://arxiv.org/search/advanced?advanced=&terms-0-operator=AND&terms-0-term=agent&terms-0-field=all&"
+        "terms-1-operator=AND&terms-1-term=language+model&terms-1-field=all&terms-2-operator=AND&terms-2-term=research&"
+        "terms-2-field=all&terms-3-operator=OR&terms-3-term=browse&terms-3-field=all&classification-computer_science=y&"
+        "classification-physics_archives=all&classification-include_cross_list=include&date-year=&"
+        "date-filter_by=date_range&date-from_date=2025-01&date-to_date=2025-02&date-date_type=announced_date_first&"
+        "abstracts=show&size=50&order=-announced_date_first&start=50"
+    )
+    assert scraper.get_api_url(0, 100) == (
+        "http://export.arxiv.org/api/query?search_query="
+        "((ti:research+OR+abs:research)+OR+(ti:browse+OR+abs:browse))+AND+(ti:agent+OR+abs:agent)"
+        "+AND+(ti:language+model+OR+abs:language+model)"
+        "&start=0&max_results=100&sortBy=submittedDate&sortOrder=descending"
+    )
@@ -0,0 +1,51 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "arxiv_crawler"))
+import async_translator
+from async_translator import _split_batches, async_translate_batch
+
+
+def run_batch(monkeypatch, texts, translate, **kwargs):
+    """用translate替换实际的翻译请求，返回(翻译结果, 每次请求的原文)"""
+    calls = []
+
+    async def fake_translate(text, langto="zh-CN", proxy=None, *, session=None, sem=None):
+        calls.append(text)
+        return translate(text)
+
+    monkeypatch.setattr(async_translator, "async_translate", fake_translate)
+    results = asyncio.run(async_translate_batch(texts, session=object(), **kwargs))
+    return results, calls
+
+
+def test_split_batches_by_encoded_length():
+    texts = ["a" * 10, "b b", "中文", "c" * 30]
+    batches = list(_split_batches(texts, max_bytes=30))
+    assert [i for batch in batches for i in batch] == [0, 1, 2, 3]
+    # 中文URL编码后每个字符占9字节，按编码后的长度分组
+    assert batches == [[0, 1], [2], [3]]
+    # 超过上限的单段文本单独成组
+    assert list(_split_batches(["x" * 100], max_bytes=30)) == [[0]]
+
+
+def test_batch_translates_in_one_request(monkeypatch):
+    texts = ["Hello 100% world", "second\nline", "a %% b"]
+    results, calls = run_batch(monkeypatch, texts, str.upper)
+    assert results == ["HELLO 100% WORLD", "SECOND LINE", "A %% B"]
+    assert calls == ["Hello 100% world\nsecond line\na %% b"]
+
+
+def test_batch_falls_back_on_line_mismatch(monkeypatch):
+    texts = ["one", "two", "three"]
+    # 批量翻译时把所有行合并成一行，各段只能逐条翻译
+    results, calls = run_batch(monkeypatch, texts, lambda text: text.replace("\n", " ").upper())
+    assert results == ["ONE", "TWO", "THREE"]
+    assert calls == ["one\ntwo\nthree", "one", "two", "three"]
+
+
+def test_single_text_failure_is_not_retried(monkeypatch):
+    results, calls = run_batch(monkeypatch, ["only"], lambda text: None)
+    assert results == [None]
+    assert calls == ["only"]
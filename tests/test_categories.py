@@ -0,0 +1,19 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "arxiv_crawler"))
+from categories import parse_categories
+
+
+def test_parse_categories():
+    assert parse_categories(["cs.AI", "unknown.XX"], lang="en") == ["Artificial Intelligence", "unknown.XX"]
+    assert parse_categories(("cs.AI",), lang="en") == parse_categories(iter(["cs.AI"]), lang="en")
+
+
+def test_parse_categories_returns_fresh_list():
+    """结果被缓存，但每次返回新的列表，调用方修改结果不会影响之后的调用"""
+    first = parse_categories(["cs.CL", "cs.AI"])
+    first.append("modified")
+    second = parse_categories(("cs.CL", "cs.AI"))
+    assert "modified" not in second
+    assert second is not first
@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from main import ArxivBot, parse_config_args
+
+
+def baseline_parse_config_args(config_str):
+    """改用正则之前handle_config_command中基于find()的解析，作为对照"""
+    required_keywords = []
+    optional_keywords = []
+    required_pos = config_str.find('required:')
+    optional_pos = config_str.find('optional:')
+    if required_pos != -1:
+        start = required_pos + len('required:')
+        end = optional_pos if optional_pos != -1 and optional_pos > required_pos else len(config_str)
+        required_str = config_str[start:end].strip()
+        if required_str:
+            required_keywords = [kw.strip() for kw in required_str.split(',') if kw.strip()]
+    if optional_pos != -1:
+        start = optional_pos + len('optional:')
+        end = required_pos if required_pos != -1 and required_pos > optional_pos else len(config_str)
+        optional_str = config_str[start:end].strip()
+        if optional_str:
+            groups = [group.strip() for group in optional_str.split(',') if group.strip()]
+            for group in groups:
+                keywords_in_group = [kw.strip() for kw in group.split(' or ') if kw.strip()]
+                if keywords_in_group:
+                    optional_keywords.append(keywords_in_group)
+    return required_keywords, optional_keywords
+
+
+@pytest.mark.parametrize(
+    "config_str, expected",
+    [
+        ("required:agent,LLM", (["agent", "LLM"], [])),
+        ("required: agent , language model ,", (["agent", "language model"], [])),
+        ("optional:A or B, C or D, E or F or G", ([], [["A", "B"], ["C", "D"], ["E", "F", "G"]])),
+        ("optional:A or B required:x,y", (["x", "y"], [["A", "B"]])),
+        ("required:x,y optional:A or B", (["x", "y"], [["A", "B"]])),
+        ("required: optional:", ([], [])),
+        ("optional:   required:agent", (["agent"], [])),
+        ("required:agent optional:", (["agent"], [])),
+        ("optional:a or, or b ,, c", ([], [["a or"], ["or b"], ["c"]])),
+        ("optional:A or  or B, C orD", ([], [["A", "B"], ["C orD"]])),
+        ("required:a optional:b required:c", (["a"], [["b required:c"]])),
+        ("no sections", ([], [])),
+    ],
+)
+def test_parse_config_args(config_str, expected):
+    assert parse_config_args(config_str) == expected
+    assert baseline_parse_config_args(config_str) == expected
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("/help", "/help"),
+        ("  /config required:agent  ", "/config required:agent"),
+        ("@_user_1 /daily_arxiv 2025-01-01,2025-01-02", "/daily_arxiv 2025-01-01,2025-01-02"),
+        ("@_user_1 @_user_2\n/config optional:A or B", "/config optional:A or B"),
+        # 指令只能出现在开头(@提及之后)，消息中间的/不再被当作指令
+        ("see https://arxiv.org/abs/2501.00001", None),
+        ("hello /help", None),
+        ("@_user_1 hello", None),
+    ],
+)
+def test_find_instruction(content, expected):
+    assert ArxivBot.find_instruction(None, content) == expected
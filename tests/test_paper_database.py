@@ -0,0 +1,70 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "arxiv_crawler"))
+from paper import Paper, PaperDatabase
+
+
+def make_paper(i, title, abstract="An abstract."):
+    return Paper(
+        first_submitted_date=datetime(2025, 1, 1),
+        title=title,
+        categories=["cs.CL"],
+        url=f"https://arxiv.org/abs/2501.{i:05d}",
+        authors="A. Author",
+        abstract=abstract,
+        comments="",
+        first_announced_date=datetime(2025, 1, 2),
+    )
+
+
+@pytest.fixture
+def db():
+    db = PaperDatabase(":memory:")
+    db.add_papers(
+        [
+            make_paper(1, "Evaluating ChatGPT on Reasoning"),
+            make_paper(2, "An MLLM for Video Understanding"),
+            make_paper(3, "Serving Models with vLLM", abstract="A large language model serving system."),
+            make_paper(4, "Explainable AI with Graph Neural Networks", abstract="Nothing related."),
+            make_paper(5, "Multi_agent Planning"),
+        ]
+    )
+    return db
+
+
+def titles(papers):
+    return sorted(paper.title for paper in papers)
+
+
+def test_build_fts_query():
+    assert PaperDatabase._build_fts_query(["agent"], [["GPT", "LLM"], ["language model"]]) == (
+        '"agent" AND ("GPT" OR "LLM") AND ("language model")'
+    )
+    assert PaperDatabase._build_fts_query([], [[], ["LLM"]]) == '("LLM")'
+    assert PaperDatabase._build_fts_query([], []) is None
+    # trigram无法匹配少于3个字符的子串，含有LIKE通配符或标点时也退回LIKE
+    assert PaperDatabase._build_fts_query(["AI"], []) is None
+    assert PaperDatabase._build_fts_query(["multi_agent"], []) is None
+    assert PaperDatabase._build_fts_query(["C++"], []) is None
+
+
+@pytest.mark.parametrize(
+    "required, optional, expected",
+    [
+        (["GPT"], [], ["Evaluating ChatGPT on Reasoning"]),
+        ([], [["LLM"]], ["An MLLM for Video Understanding", "Serving Models with vLLM"]),
+        (["language model"], [], ["Serving Models with vLLM"]),
+        (["llm"], [["video", "serving"]], ["An MLLM for Video Understanding", "Serving Models with vLLM"]),
+        (["AI"], [], ["Explainable AI with Graph Neural Networks"]),
+        (["multi_agent"], [], ["Multi_agent Planning"]),
+    ],
+)
+def test_search_papers_by_keywords_matches_like(db, required, optional, expected):
+    """FTS查询与LIKE查询的结果一致(关键词作为不区分大小写的子串匹配)"""
+    assert titles(db.search_papers_by_keywords(required, optional)) == expected
+    db._has_fts = False
+    assert titles(db.search_papers_by_keywords(required, optional)) == expected